@@ -1,8 +1,11 @@
 '''
-In this design, the puzzle is stored in common list for best convenience.
+In this design, the puzzle is generated in common list for best convenience.
 Number tiles are represented by integer and blank space by " ".
 Especially when we check if the puzzle is solvable,
 we replace the " " by 0 to better compute the inverse sum.
+While playing, it is kept in a Board from puzzle_core.py, shared with A2,
+which remembers the blank cell and the number of misplaced tiles,
+so every move and every check of the result costs the same on any size.
 
 Note that when looking for the blank position,
 we use (row, column) to represent its coordinate,
@@ -13,28 +16,57 @@ The randomly generated puzzle is solvable if and only if,
 the size is odd and the total inverse sum is even,
 or the size is even and the total inverse sum is odd,
 provided that total inverse sum = inverse sum + x, y coordinates of blank space
+The check itself lives in puzzle_solvability.py and is shared with A2.
 
 
 Below is the decomposition of the program:
 
 a. generate puzzles:
-generate_a_puzzle() -> use random module to create puzzles in list form
-check_if_solvable() -> check if the puzzle is solvable
+generate_a_puzzle() -> create a solvable puzzle in one pass in list form
+check_if_solvable() -> check if the puzzle is solvable by is_solvable()
 
 b. input letters to represent direction:
 prompt_designated letters() -> prompt input from users
 validate_input_letters() -> check if the input is approriate
 
 c. play puzzles:
-display_the_puzzle() -> display the puzzle every time it is updated
+display_the_puzzle() -> display the puzzle with a single write
 locate_blank() -> find the empty space and return its location
 find_proper_moves() -> find valid moves every time the puzzle is updated
-play_the_puzzle() -> prompt input and update the puzzle 
+play_the_puzzle() -> prompt input and update the puzzle, again and again
+After a move, a TerminalRenderer from puzzle_render.py only rewrites the
+two cells that changed when playing in a terminal.
+Any puzzle gives a hint only when ? is entered as a move.
+The 3x3 puzzle shows the optimal move and distance, looked up in the
+table of puzzle_table.py. The others are hinted optimally only if the
+solution is already cached by puzzle_cache.py, as a search could block
+the prompt for a minute. Otherwise the hints follow one solution of
+the constructive solver of puzzle_large_solver.py, as A2 does for
+large puzzles.
 
-d. main()
+d. replay move scripts without prompting:
+read_move_script() -> read the letters of a script chunk by chunk
+replay_move_script() -> apply a script to a puzzle and report the result
+Scripts can be tens of millions of moves long, as they are never
+kept in memory as a whole. Only the final puzzle is displayed,
+or every Nth one with --every N.
+
+e. main() -> play, or replay a script given by --script
 '''
 
-from random import shuffle
+import argparse
+import random
+import sys
+from puzzle_generator import generate_solvable
+from puzzle_solvability import is_solvable
+from puzzle_cache import SolutionCache
+from puzzle_core import Board
+from puzzle_large_solver import solve_large
+from puzzle_render import TerminalRenderer, render_frame
+import puzzle_table
+
+CHUNK = 1 << 16
+HINT = "?"
 
 def generate_a_puzzle(size:int) -> list:
     '''
@@ -44,15 +76,11 @@ def generate_a_puzzle(size:int) -> list:
     Return:
         Returns the generated puzzle and its final appear in list form.
     '''
-    while True:
-        original_position = list(range(1, size**2))
-        original_position.append(" ")
-        shuffle(original_position)
-        sequential_position = list(range(1, size**2))
-        sequential_position.append(" ")
-        if check_if_solvable(original_position, size):
-            display_the_puzzle(original_position, size)
-            return original_position, sequential_position
+    original_position = generate_solvable(size)
+    sequential_position = list(range(1, size**2))
+    sequential_position.append(" ")
+    display_the_puzzle(original_position, size)
+    return original_position, sequential_position
 
 def check_if_solvable(position_list:list, size:int) -> bool:
     '''
@@ -63,31 +91,19 @@ def check_if_solvable(position_list:list, size:int) -> bool:
     Return:
         Returns the check result by comparing size and total inverse sum
     '''
-    cordinate_sum = sum(locate_blank(position_list, size))
-    check_list = [0 if i == " " else i for i in position_list]
-    inverse_sum = 0
-    for i in range(size**2):
-        for j in range(i):
-            if check_list[j] > check_list[i]:
-                inverse_sum += 1
-    inverse_sum += cordinate_sum
-    if (size % 2) != (inverse_sum % 2):
-        return True
-    return False
+    return is_solvable(position_list, size)
 
-def locate_blank(position_list: list, size: int) -> list:
+def locate_blank(state: Board, size: int) -> list:
     '''
     Parameters:
-        position_list (list): The puzzle in process in list form
+        state (Board): The puzzle in process
         size (int): An integer suggested to be >= 3
     
     Return:
         Returns the cordinate of the empty space in list form
     '''
-    cordinate = position_list.index(" ")
-    x_cordinate = (cordinate % size) + 1
-    y_cordinate = (cordinate // size) + 1
-    return [x_cordinate, y_cordinate]
+    # the coordinates of every cell are computed once per size
+    return state.locate_blank()
 
 def display_the_puzzle(position_list:list, size:int) -> None:
     '''
@@ -95,13 +111,9 @@ def display_the_puzzle(position_list:list, size:int) -> None:
         position_list (list): The puzzle in process in list form
         size (int): An integer suggested to be >= 3
     '''
-    print()
-    for i in range(size**2):
-        tile = str(position_list[i])
-        print(tile.rjust(len(str(size**2-1))+1),end="")
-        if (i+1) % size == 0:
-            print()
-    print()
+    # the whole frame is built first and written at once
+    sys.stdout.write(render_frame(position_list, size))
+    sys.stdout.flush()
 
 def prompt_designated_letters() ->dict:
     '''
@@ -142,73 +154,174 @@ def play_the_puzzle(designated_letters:dict, size:int) -> None:
         designated_letters (dict): The designated letters in dictionary form
         size (int): An integer suggested to be >= 3
     '''
-    cnt = 0
-    
-    trans, sequential_position = generate_a_puzzle(size)
-    while trans != sequential_position:
-        proper_moves = find_proper_moves(trans, designated_letters, size)
-        index = trans.index(" ")
-        # Validate the user input
-        while True:
-            move = (input("Enter your move(" + ", ".join(proper_moves)
-                          + ")>").replace(" ","")).lower()
-            if move not in [x[-1] for x in proper_moves]:
-                print(f"Your choice should be made among {proper_moves}")
-            else:
-                break
-        # Play the puzzle according to the user input
-        if move == designated_letters["left"]:
-            trans[index], trans[index+1] = trans[index+1], trans[index]
-        if move == designated_letters["right"]:
-            trans[index], trans[index-1] = trans[index-1], trans[index]
-        if move == designated_letters["up"]:
-            trans[index], trans[index+size] = trans[index+size], trans[index]
-        if move == designated_letters["down"]:
-            trans[index], trans[index-size] = trans[index-size], trans[index]
-        display_the_puzzle(trans, size)   
-        cnt += 1
-    print(f"Congratulations! You solved the puzzle in {cnt} moves!")
-    choice = input("Enter w to play again \
+    cache = SolutionCache()
+    while True:
+        cnt = 0
+        # the constructive solution followed by the hints not cached
+        plan, planned = None, None
+
+        original_position, _ = generate_a_puzzle(size)
+        trans = Board(original_position, size)
+        renderer = TerminalRenderer(size)
+        while not trans.is_solved():
+            proper_moves = find_proper_moves(trans, designated_letters, size)
+            # Validate the user input
+            while True:
+                move = (input("Enter your move(" + ", ".join(proper_moves)
+                              + ")>").replace(" ","")).lower()
+                if move == HINT and size == puzzle_table.SIZE:
+                    # the 3x3 puzzle has a complete table of optimal distances
+                    position_list = trans.to_list()
+                    hint = puzzle_table.best_move(position_list)
+                    print(f"Hint: {puzzle_table.distance(position_list)} "
+                          f"moves at best, try {hint}-"
+                          f"{designated_letters[hint]}")
+                elif move == HINT:
+                    hint = cache.cached_move(trans.to_list(), size)
+                    if hint is None:
+                        # one solution is kept while it is followed,
+                        # planning again could lead round in circles
+                        if plan is None:
+                            plan = solve_large(trans.to_list(), size)
+                        if planned is None:
+                            planned = next(plan)
+                        hint = planned
+                    print(f"Hint: try {hint}-{designated_letters[hint]}")
+                elif move not in [x[-1] for x in proper_moves]:
+                    print(f"Your choice should be made among {proper_moves}")
+                else:
+                    break
+            # Play the puzzle according to the user input
+            blank = trans.blank
+            for direction, letter in designated_letters.items():
+                if move == letter:
+                    trans.move(direction)
+                    # a move away from the plan of the hints makes it useless
+                    if direction != planned:
+                        plan = None
+                    planned = None
+            renderer.moved(trans.tiles, (blank, trans.blank))
+            cnt += 1
+        print(f"Congratulations! You solved the puzzle in {cnt} moves!")
+        choice = input("Enter w to play again \
 or any other keys to end the game>").replace(" ","")
-    if choice == "w":
-        play_the_puzzle(designated_letters, size)
-    else:
-        print("See u next time!")
+        # play again in the same loop instead of calling itself
+        if choice != "w":
+            print("See u next time!")
+            cache.close()
+            return
 
 
-def find_proper_moves(position_list:list, 
+def find_proper_moves(state:Board, 
                            designated_letters:dict, 
                            size:int) -> list:
     '''
     Parameters:
-        position_list (list): The puzzle in process in list form
+        state (Board): The puzzle in process
         designated_letters (dict): The designated letters in dictionary form
         size (int): An integer suggested to be >= 3
     
     Return:
         Returns the proper moves in list form
     '''
-    proper_moves = []
-    x, y = locate_blank(position_list, size) 
-    if x != size:
-        proper_moves.append("left-" + designated_letters["left"])                                                                                            
-    if x != 1:
-        proper_moves.append("right-" + designated_letters["right"])
-    if y != size:
-        proper_moves.append("up-" + designated_letters["up"])
-    if y != 1:
-        proper_moves.append("down-" + designated_letters["down"])
-    return proper_moves
+    # the proper moves of every blank cell are computed once per size
+    return [direction + "-" + designated_letters[direction]
+            for direction in state.moves()]
+
+
+def read_move_script(stream, chunk:int=CHUNK):
+    '''
+    Parameters:
+        stream: A text file or sys.stdin containing the move letters
+        chunk (int): The number of characters read at a time
+
+    Return:
+        Yields the letters one by one, spaces and newlines skipped
+    '''
+    while True:
+        text = stream.read(chunk)
+        if not text:
+            return
+        for letter in text:
+            if not letter.isspace():
+                yield letter.lower()
 
+def replay_move_script(letters, designated_letters:dict, size:int,
+                       seed:int=None, renderer:TerminalRenderer=None) -> tuple:
+    '''
+    Parameters:
+        letters: The move letters, for example from read_move_script()
+        designated_letters (dict): The designated letters in dictionary form
+        size (int): An integer suggested to be >= 3
+        seed (int): The seed that decides the puzzle
+        renderer (TerminalRenderer): Shows the moves, if given
+
+    Return:
+        Returns the error message or None if the script is valid,
+        the puzzle after the script and the number of moves made
+    '''
+    direction_of = {g:s for s,g in designated_letters.items()}
+    trans = Board.random(size, random.Random(seed))
+    cnt = 0
+    for letter in letters:
+        direction = direction_of.get(letter)
+        if direction is None:
+            return f"Unknown letter {letter!r} after {cnt} moves", trans, cnt
+        if not trans.is_proper(direction):
+            return f"Improper move {direction}-{letter} after {cnt} moves", \
+                trans, cnt
+        blank = trans.blank
+        trans.move(direction)
+        cnt += 1
+        if renderer is not None:
+            renderer.moved(trans.tiles, (blank, trans.blank))
+    return None, trans, cnt
 
 def main():
-    
+    parser = argparse.ArgumentParser(description="Willow's puzzle game")
+    parser.add_argument("--script", help="replay the moves of this file \
+without prompting, - for stdin")
+    parser.add_argument("--seed", type=int, help="seed of the puzzle")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--letters", default="lrud", help="letters of \
+left, right, up and down move in a script")
+    parser.add_argument("--every", type=int, default=0, help="display \
+every Nth puzzle of a script, 0 for only the final one")
+    args = parser.parse_args()
+
+    if args.script:
+        try:
+            validate_input_letters(args.letters)
+        except ValueError as err_msg:
+            parser.error(str(err_msg))
+        directions = ["left", "right", "up", "down"]
+        designated_letters = dict(zip(directions, args.letters.lower()))
+        renderer = TerminalRenderer(args.size, every=args.every)
+        if args.script == "-":
+            result = replay_move_script(read_move_script(sys.stdin),
+                                        designated_letters, args.size,
+                                        args.seed, renderer)
+        else:
+            with open(args.script) as stream:
+                result = replay_move_script(read_move_script(stream),
+                                            designated_letters, args.size,
+                                            args.seed, renderer)
+        error, trans, cnt = result
+        renderer.finish(trans.tiles)
+        print(f"Valid: {'no, ' + error if error else 'yes'}")
+        print(f"Solved: {'yes' if trans.is_solved() else 'no'}")
+        print(f"Moves: {cnt}")
+        return
+
     print("Welcome to Willow's puzzle game, \
 try to repeatedly slide one adjacent tile, \
 until all numbers are ordered sequentially \
-from left to right, top to bottom.\n")
-    size = 3
+from left to right, top to bottom. \
+Enter ? instead of a move for a hint.\n")
+    if args.seed is not None:
+        random.seed(args.seed)
     designated_letters = prompt_designated_letters()
-    play_the_puzzle(designated_letters, size)
-    
-main()
+    play_the_puzzle(designated_letters, args.size)
+
+if __name__ == "__main__":
+    main()
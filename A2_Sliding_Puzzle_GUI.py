@@ -2,126 +2,176 @@
 Here is the data model:
 
 Puzzle -> stored in common list  a.Number tiles: integer b.blank space: " "
-Tiles -> stored in list[turtle.Turtle]
-Num_tiles -> stored in list[turtle.Turtle]
-Actually, num_tiles is a duplicated set of tiles by hiding original shape.
+Game -> a PuzzleGame from puzzle_game.py, with the state and the rules
+        but no graphics, which tells a TurtleRenderer what to draw
+Tiles -> stored in list[turtle.Turtle], or list[int] beyond 5x5
+Num_tiles -> stored in list[int]
+Actually, num_tiles are the canvas text items of every place,
+so a number is changed in place instead of written again.
+
+Up to 5x5 the tiles are turtles. Larger puzzles, up to 30x30, would need
+hundreds of them, so every tile is a plain canvas rectangle instead,
+all created at once with the tracer off. Either way a tile stays at its
+place, and an exchange only swaps the colors of two places.
+The distance between tiles is computed from the window size, and so is
+the place of a click.
+
+Everything is drawn with the tracer off, and the screen is updated once
+per frame. A click only changes the two places of the exchange,
+so it costs the same on every size.
 
 Note that the display sequence of the puzzle is from bottom to top.
 This means that the elements in the puzzle list are not in regular sequence.
-Therefore, part of the codes are specifically designed to modulate the order,
-which might be a little bit tricky here.
+Therefore, the puzzle is played on a Board from puzzle_core.py, shared with A1,
+kept from top to bottom, and the order is changed by a display table
+computed once per size, so no list is ever reordered on a click.
 
 Also, the conclusion used to check sovability is noteworthy:
 The randomly generated puzzle is solvable if and only if,
 the size is odd and the total inverse sum is even,
 or the size is even and the total inverse sum is odd,
 provided that total inverse sum = inverse sum + x, y coordinates of blank space.
+The check itself lives in puzzle_solvability.py and is shared with A1.
 
 Below is the decomposition of the program:
 
 a. generate puzzles:
-generate_a_puzzle() -> use random module to create puzzles in list form
-check_if_solvable() -> check if the puzzle is solvable
+generate_a_puzzle() -> create a solvable puzzle in one pass in list form
+check_if_solvable() -> check if the puzzle is solvable by is_solvable()
 
 b. display puzzles:
+tile_geometry() -> compute the distance between tiles from the window size
 create_a_tile() -> use turtle graphics to create a single tile
 display_tiles() -> put tiles into appropriate positions and color them
-clone_tiles() -> generate a duplicated set of tiles and change original setting
-write_numbers() -> mark tiles with according numbers
+display_cells() -> the same with canvas rectangles for large puzzles
+paint() -> color a tile, a turtle or a rectangle
+clone_tiles() -> create a text item on the canvas for every place
+write_numbers() -> mark tiles with according numbers, all or only some
 The last one is detached as a single function because of its reusability.
 
 c. play puzzles:
-set_mouse_click() -> handle the mouse click and do exchange if needed
-is_adjacent() -> check if the selected tile is adjacent to the blank tile
+set_mouse_click() -> queue the mouse click with its time
+frame_tick() -> everything of a frame, then draw it once
+drain_clicks() -> hand the queued clicks to the game or the buttons
+TurtleRenderer -> draw what the game tells, and find the place of a click
+PuzzleGame.click() does the exchange if needed.
+The mouse click is never turned off, so no click is lost. Every frame
+handles all clicks queued since the last one, so the puzzle never falls
+behind however fast the clicks come, and draws the result only once.
+Repeated clicks on one place within a moment, like a double click,
+count as one.
+
+d. solve puzzles:
+request_hint() -> show the tile of the next optimal move, for the hint
+                  button or a click on the blank
+request_solve() -> play the whole solution, for the solve button
+follow_job() -> report the progress of the search and use its result
+play_moves() -> play the solution at the speed chosen with + and -
+cancel_solver() -> stop the search and the solution, for the cancel
+                   button or Esc
+A solution not cached yet is searched by a SolverJob of puzzle_worker.py
+in another process, so the puzzle keeps answering clicks while a hard 5x5
+is solved. It is played one move after another on every frame, but never
+for longer than a part of the frame, so the clicks are never kept waiting.
+Beyond 5x5 a hint is the next move of solve_large(), found at once.
+
 locate_blank() -> find the empty space and return its location
+Whether a tile is next to the blank is looked up by Board.move_name().
 
 '''
 
-from random import shuffle
 import turtle
+from collections import deque
+from time import perf_counter
+from puzzle_cache import NAMES, SolutionCache
+from puzzle_core import Board, layout
+from puzzle_game import LARGE, NullRenderer, PuzzleGame
+from puzzle_solvability import is_solvable
+from puzzle_worker import SolverJob
+
+WINDOW = 600
+MARGIN = 60
+# the distance between tiles up to 5x5
+PITCH = 90
+# the milliseconds between two frames
+FRAME = 16
+# clicks on one place within these seconds count once
+COALESCE = 0.15
+# the seconds of a frame the solution may be played for
+BUDGET = 0.008
+# the moves per second a solution is played at, changed with + and -
+SPEED = 8
+MAX_SPEED = 1024
 
 def generate_a_puzzle(size:int) -> list:
     '''
     Parameter:
-        size (int): An integer suggested to be 3,4 or 5
+        size (int): An integer suggested to be 3 to 30
     
     Return:
         Returns the generated puzzle and its final appear in list form.
     '''
-    while True:
-
-        original_position = list(range(1, size**2))
-        original_position.append(" ")
-        shuffle(original_position)
-
-        key_position = []
-        for i in range(1, size+1):
-            append_list = list(range(size*(size-i)+1, size*(size-i)+size+1))
-            key_position += append_list
-        key_position = [" " if i == size*size else i for i in key_position]
-
-        if check_if_solvable(original_position, size):
-            return original_position, key_position
+    # generate from top to bottom and show it from bottom to top
+    original_position = Board.random(size).display_list()
+    key_position = list(layout(size).display_goal)
+    return original_position, key_position
 
 def check_if_solvable(position_list:list, size:int) -> bool:
     '''
     Parameters:
         position_list (list): The generated puzzle in list form
-        size (int): An integer suggested to be 3,4 or 5
+        size (int): An integer suggested to be 3 to 30
     
     Return:
         Returns the check result by comparing size and total inverse sum
     '''
-    x, y = locate_blank(position_list, size)
-    cordinate_sum = (x-1) + (size-y)
-
-    check_list = []
-    for i in range(1, size+1):
-        for j in range(size*(size-i), size*(size-i)+size):
-            check_list.append(position_list[j])
-    check_list = [0 if i == " " else i for i in check_list]
-
-    inverse_sum = 0
-    for i in range(size**2):
-        for j in range(i):
-            if check_list[j] > check_list[i]:
-                inverse_sum += 1
-
-    inverse_sum += cordinate_sum
-    if (size % 2) != (inverse_sum % 2):
-        return True
-    return False
+    # reorder the puzzle from bottom-to-top into top-to-bottom
+    display = layout(size).display
+    return is_solvable([position_list[i] for i in display], size)
 
 def locate_blank(position_list: list, size: int) -> list:
     '''
     Parameters:
         position_list (list): The puzzle in process in list form
-        size (int): An integer suggested to be 3,4 or 5
+        size (int): An integer suggested to be 3 to 30
     
     Return:
         Returns the cordinate of the empty space in list form
     '''
-    cordinate = position_list.index(" ")
-    x_cordinate = (cordinate % size) + 1
-    y_cordinate = (cordinate // size) + 1
-    return [x_cordinate, y_cordinate]
+    # the coordinates of every place are computed once per size
+    return list(layout(size).coordinates[position_list.index(" ")])
 
-def display_tiles(x:int, size:int) -> list[turtle.Turtle]:
+def tile_geometry(size:int) -> tuple:
     '''
     Parameters:
-        x (int): An integer represents the start point of diplay
+        size (int): An integer suggested to be 3 to 30
+
+    Return:
+        Returns the distance between two tiles and the center of the
+        first one, in both directions, so the puzzle is centered
+    '''
+    pitch = min(PITCH, (WINDOW - 2*MARGIN) // size)
+    start = -pitch * (size-1) / 2
+    return pitch, start
+
+def display_tiles(trans:list, start:float, pitch:int,
+                  size:int) -> list[turtle.Turtle]:
+    '''
+    Parameters:
+        trans (list): The puzzle in process in list form
+        start (float): The center of the first tile in both directions
+        pitch (int): The distance between two tiles
         size (int): An integer suggested to be 3,4 or 5
 
     Return:
         Returns the list contaning all the turtle tiles
     '''
-    t = create_a_tile()
-    sz = 90
+    t = create_a_tile((pitch-10) / 20)
     tiles = []
 
-    for cy in range(x, x+sz*size, sz):
-        for cx in range(x, x+sz*size, sz):
-            t.goto(cx,cy)
+    for row in range(size):
+        for col in range(size):
+            t.goto(start + pitch*col, start + pitch*row)
             tiles.append(t)
             t = t.clone()
     t.hideturtle()
@@ -133,11 +183,47 @@ def display_tiles(x:int, size:int) -> list[turtle.Turtle]:
             tiles[i].color("white")
 
     return tiles
+
+def display_cells(trans:list, start:float, pitch:int, size:int) -> list[int]:
+    '''
+    Parameters:
+        trans (list): The puzzle in process in list form
+        start (float): The center of the first tile in both directions
+        pitch (int): The distance between two tiles
+        size (int): An integer suggested to be 6 to 30
+
+    Return:
+        Returns the list contaning the rectangle item of every place
+    '''
+    canvas = turtle.getcanvas()
+    half = pitch * 0.47
+    cells = []
+
+    # the canvas counts y downwards, turtle upwards
+    for i in range(size*size):
+        x = start + pitch*(i % size)
+        y = -(start + pitch*(i // size))
+        color = "lightgreen" if trans[i] != " " else "white"
+        cells.append(canvas.create_rectangle(x-half, y-half, x+half, y+half,
+                                             fill=color, outline=""))
+
+    return cells
+
+def paint(tile, color:str) -> None:
+    '''
+    Parameters:
+        tile (turtle.Turtle or int): A turtle tile or a rectangle item
+        color (str): The new color of the tile
+    '''
+    if isinstance(tile, turtle.Turtle):
+        tile.color(color)
+    else:
+        turtle.getcanvas().itemconfig(tile, fill=color)
         
-def create_a_tile(sz:int=4, border:int=5) -> turtle.Turtle:
+def create_a_tile(sz:float=4, border:int=5) -> turtle.Turtle:
     '''
     Parameters:
-        sz (int): An integer represents the size of the tile
+        sz (float): A number represents the size of the tile
         border (int): An integer represents the border of the tile
 
     Return:
@@ -148,108 +234,375 @@ def create_a_tile(sz:int=4, border:int=5) -> turtle.Turtle:
     t.shapesize(sz, sz, border)
     return t
 
-def clone_tiles(tiles:list[turtle.Turtle]) -> list[turtle.Turtle]:
+def clone_tiles(start:float, pitch:int, size:int) -> list[int]:
     '''
     Parameters:
-        tiles (list[turtle.Turtle]): A list contaning all the turtle tiles
+        start (float): The center of the first tile in both directions
+        pitch (int): The distance between two tiles
+        size (int): An integer suggested to be 3 to 30
 
     Return:
-        Returns the list contaning all the turtle num_tiles
+        Returns the list contaning the text item of every place
     '''
+    canvas = turtle.getcanvas()
+    font = ("Arial", max(6, pitch * 20 // PITCH))
     numbers = []
-    
-    for t in tiles:
-        n = t.clone()
-        n.hideturtle()
-        n.goto(t.xcor(), t.ycor()-12)
-        n.color("blue")
-        n.pensize(15)
-        numbers.append(n)
+
+    # placed like turtle.write() would, a bit below the center
+    for i in range(size*size):
+        x = start + pitch*(i % size)
+        y = start + pitch*(i // size) - pitch * 12 / PITCH
+        numbers.append(canvas.create_text(x-1, -y, text="", anchor="s",
+                                          fill="blue", font=font))
 
     return numbers
 
-def write_numbers(trans:list, clone_tiles:list[turtle.Turtle]) -> None:
+def write_numbers(trans:list, clone_tiles:list[int], places=None) -> None:
     '''
     Parameters:
-        trans (list): The puzzle in process in list form
-        clone_tiles (list[turtle.Turtle]): A list contaning all cloned tiles
+        trans (list): The puzzle in process in list form,
+            or a dictionary with the numbers of some places
+        clone_tiles (list[int]): A list contaning all text items
+        places: The places to mark again, all of them by default
     '''
-    for i in range(len(clone_tiles)):
-        clone_tiles[i].write(trans[i], font=("Arial",20), align="center")
+    canvas = turtle.getcanvas()
+    if places is None:
+        places = range(len(clone_tiles))
+    for i in places:
+        canvas.itemconfig(clone_tiles[i], text=trans[i])
 
 def set_mouse_click(x:float, y:float) -> None:
     '''
     Parameters:
         x,y (float): Represent the coordinate of the click position
     '''
-    row = (y+190)//90 + 1
-    col = (x+190)//90 + 1
-    xcor, ycor = locate_blank(trans, size)
-
-    # prohibit the mouseclick event to avoid trouble
-    turtle.onscreenclick(None)
-
-    if is_adjacent(row, col, xcor, ycor):
-
-        num_blank = int(ycor*size - (size-xcor) - 1)
-        num_tile = int(row*size - (size-col) - 1)
-
-        # do the exchange of tiles
-        trans[num_blank],trans[num_tile] = trans[num_tile], trans[num_blank]
-        number_tiles[num_tile].clear()
-        blank_position = tiles[num_blank].position()
-        tile_position  = tiles[num_tile].position()
-        tiles[num_tile].goto(blank_position)
-        tiles[num_blank].speed(0)
-        tiles[num_blank].goto(tile_position)
-        tiles[num_tile], tiles[num_blank] = tiles[num_blank], tiles[num_tile]
-        write_numbers(trans, number_tiles)
-
-        # check whether the puzzle has been solved
-        if trans == key:
-            for i in range(0, size*size):
-                if trans[i] != " ":
-                    tiles[i].color("red")
-            write_numbers(trans, number_tiles)
-
-    # turn on the mouseclick event
-    turtle.onscreenclick(set_mouse_click)
-        
-def is_adjacent(row:int, column:int, xcor:int, ycor:int) -> bool:
+    # handled by the next frame, so the click event returns at once
+    clicks.append((perf_counter(), x, y))
+
+def frame_tick() -> None:
+    '''
+    Handles the clicks, the solver and the solution, draws the result
+    and waits for the next frame
+    '''
+    changed = drain_clicks()
+    changed = follow_job() or changed
+    changed = play_moves() or changed
+
+    # draw everything changed in the frame at once
+    if changed:
+        renderer.frame()
+    turtle.ontimer(frame_tick, FRAME)
+
+def drain_clicks() -> bool:
+    '''
+    Return:
+        Returns True if anything has to be drawn again
+    '''
+    global last_click
+
+    changed = False
+    while clicks:
+        stamp, x, y = clicks.popleft()
+        target = renderer.button_at(x, y) or renderer.cell_of(x, y)
+        if last_click is not None and last_click[1] == target \
+                and stamp - last_click[0] < COALESCE:
+            continue
+        last_click = (stamp, target)
+
+        if target == "hint" or is_blank(target):
+            request_hint()
+        elif target == "solve":
+            if job is not None or playback:
+                cancel_solver()
+            else:
+                request_solve()
+        elif game.click(*target) not in (None, "hint"):
+            # a move of the player's own ends the solution played
+            playback.clear()
+            renderer.label("solve", "Solve")
+        changed = True
+
+    return changed
+
+def is_blank(target) -> bool:
     '''
     Parameters:
-        row,column (int): The position of the mouse click
-        xcor,ycor(int): The position of the blank tile
+        target: The (row, col) of a click, or the name of a button
 
     Return:
-        Returns the check result of whether is adjacent or not
+        Returns True if the click is on the blank
+    '''
+    if isinstance(target, str):
+        return False
+    row, col = target
+    if not (0 <= row < size and 0 <= col < size):
+        return False
+    return game.display[row*size + col] == game.board.blank
+
+def cached_moves() -> list:
+    '''
+    Return:
+        Returns the cached solution of the puzzle in list form, or None
     '''
-    adjacent_tiles = []
+    if size > LARGE:
+        return None
+    if game.is_solved():
+        return []
+    letters = cache.get(game.board.state())
+    return None if letters is None else [NAMES[l] for l in letters]
+
+def start_job(goal:str) -> None:
+    '''
+    Parameters:
+        goal (str): "hint" or "solve", what the solution is searched for
+    '''
+    global job, purpose
 
-    if xcor > 1:
-        adjacent_tiles.append((xcor-1,ycor))
-    if xcor < size:
-        adjacent_tiles.append((xcor+1,ycor))
-    if ycor > 1:
-        adjacent_tiles.append((xcor,ycor-1))
-    if ycor < size:
-        adjacent_tiles.append((xcor,ycor+1))
+    if job is not None:
+        job.cancel()
+    job, purpose = SolverJob(game.board.to_list(), size), goal
+    renderer.label("solve", "Cancel")
+    renderer.status("Searching...")
 
-    if (column, row) in adjacent_tiles:
+def request_hint() -> None:
+    '''
+    Shows the tile of the next optimal move, at once or after the search
+    '''
+    if game.is_solved():
+        return
+    if size > LARGE:
+        game.show_hint(game.hint())
+        return
+    moves = cached_moves()
+    if moves is None:
+        start_job("hint")
+    else:
+        game.show_hint(moves[0])
+
+def request_solve() -> None:
+    '''
+    Plays the whole solution, at once or after the search
+    '''
+    global allowance
+
+    moves = cached_moves()
+    if moves is None:
+        start_job("solve")
+        return
+    playback.extend(moves)
+    allowance = 0.0
+    renderer.label("solve", "Cancel")
+
+def follow_job() -> bool:
+    '''
+    Return:
+        Returns True if anything has to be drawn again
+    '''
+    global job, allowance
+
+    if job is None:
+        return False
+    if not job.poll():
+        renderer.status(f"Searching... {job.elapsed():.0f}s, "
+                        f"bound {job.bound}, {job.nodes:,} nodes")
         return True
-    return False
-    
+
+    finished, job = job, None
+    renderer.label("solve", "Solve")
+    if finished.error is not None:
+        renderer.status(finished.error)
+        return True
+    moves = finished.moves
+    if size <= LARGE and moves:
+        cache.put(Board(finished.board, size).state(), moves)
+    renderer.status(f"Solved in {len(moves)} moves "
+                    f"after {finished.elapsed():.1f}s")
+    # the player may have moved meanwhile
+    if finished.board != game.board.to_list():
+        return True
+    if purpose == "hint":
+        if moves:
+            game.show_hint(moves[0])
+    else:
+        playback.extend(moves)
+        allowance = 0.0
+        renderer.label("solve", "Cancel")
+    return True
+
+def play_moves() -> bool:
+    '''
+    Return:
+        Returns True if anything has to be drawn again
+    '''
+    global allowance
+
+    if not playback:
+        return False
+    # moves are owed by the speed, but played only within the budget
+    allowance = min(allowance + speed * FRAME / 1000, speed)
+    deadline = perf_counter() + BUDGET
+    while playback and allowance >= 1 and perf_counter() < deadline:
+        move = playback.popleft()
+        game.click_place(game.display[game.board.source(move)])
+        allowance -= 1
+    if not playback:
+        renderer.label("solve", "Solve")
+    return True
+
+def change_speed(factor:float) -> None:
+    '''
+    Parameters:
+        factor (float): What the speed of the solution is multiplied by
+    '''
+    global speed
+
+    speed = max(1, min(MAX_SPEED, int(speed * factor)))
+    renderer.status(f"Speed: {speed} moves/s")
+
+def cancel_solver() -> None:
+    '''
+    Stops the search and the solution being played
+    '''
+    global job
+
+    if job is not None:
+        job.cancel()
+        job = None
+        renderer.status("Cancelled")
+    playback.clear()
+    renderer.label("solve", "Solve")
+
+class TurtleRenderer(NullRenderer):
+    '''
+    Draws a PuzzleGame with turtle graphics.
+    '''
+
+    def __init__(self, size:int):
+        '''
+        Parameters:
+            size (int): An integer suggested to be 3 to 30
+        '''
+        self.size = size
+        self.pitch, self.origin = tile_geometry(size)
+        self.tiles = []
+        self.number_tiles = []
+        self.buttons = {}
+        self.status_text = None
+
+    def cell_of(self, x:float, y:float) -> tuple:
+        '''
+        Parameters:
+            x,y (float): Represent the coordinate of the click position
+
+        Return:
+            Returns the row, counted from the bottom, and the column of
+            the click, both from 0 and maybe outside the puzzle
+        '''
+        row = int((y - self.origin + self.pitch/2) // self.pitch)
+        col = int((x - self.origin + self.pitch/2) // self.pitch)
+        return row, col
+
+    def start(self, game:PuzzleGame) -> None:
+        trans = game.display_list()
+        if self.size > LARGE:
+            self.tiles = display_cells(trans, self.origin, self.pitch,
+                                       self.size)
+        else:
+            self.tiles = display_tiles(trans, self.origin, self.pitch,
+                                       self.size)
+        self.number_tiles = clone_tiles(self.origin, self.pitch, self.size)
+        write_numbers(trans, self.number_tiles)
+
+        # the buttons and the status line above the puzzle
+        canvas = turtle.getcanvas()
+        top = -(WINDOW/2 - MARGIN/2)
+        for name, label, left in (("hint", "Hint", -WINDOW/2 + 20),
+                                  ("solve", "Solve", -WINDOW/2 + 100)):
+            box = (left, top - 14, left + 70, top + 14)
+            canvas.create_rectangle(*box, fill="lightgrey", outline="grey")
+            text = canvas.create_text(left + 35, top, text=label,
+                                      font=("Arial",12))
+            self.buttons[name] = (box, text)
+        self.status_text = canvas.create_text(-WINDOW/2 + 185, top, text="",
+                                              anchor="w", font=("Arial",11))
+        turtle.update()
+
+    def button_at(self, x:float, y:float) -> str:
+        '''
+        Parameters:
+            x,y (float): Represent the coordinate of the click position
+
+        Return:
+            Returns the name of the button clicked, or None
+        '''
+        for name, ((x0, y0, x1, y1), _) in self.buttons.items():
+            # the canvas counts y downwards, turtle upwards
+            if x0 <= x <= x1 and y0 <= -y <= y1:
+                return name
+        return None
+
+    def label(self, name:str, text:str) -> None:
+        '''
+        Parameters:
+            name (str): The name of the button
+            text (str): The new text of the button
+        '''
+        turtle.getcanvas().itemconfig(self.buttons[name][1], text=text)
+
+    def status(self, text:str) -> None:
+        '''
+        Parameters:
+            text (str): The new text of the status line
+        '''
+        turtle.getcanvas().itemconfig(self.status_text, text=text)
+
+    def swap(self, game:PuzzleGame, blank_place:int, tile_place:int) -> None:
+        # the tiles stay and swap their colors
+        paint(self.tiles[blank_place], "lightgreen")
+        paint(self.tiles[tile_place], "white")
+        numbers = {p: game.number_at(p) for p in (blank_place, tile_place)}
+        write_numbers(numbers, self.number_tiles, numbers)
+
+    def hint(self, game:PuzzleGame, place:int, shown:bool) -> None:
+        paint(self.tiles[place], "gold" if shown else "lightgreen")
+
+    def solved(self, game:PuzzleGame) -> None:
+        for place, tile in enumerate(self.tiles):
+            if game.number_at(place) != " ":
+                paint(tile, "red")
+
+    def frame(self) -> None:
+        turtle.update()
+
 if __name__ == "__main__":
 
     size = int(turtle.numinput("Willow's Puzzle", "Enter \
-the size of the game 3,4 or 5:", minval = 3, maxval = 5))
+the size of the game 3 to 30:", minval = 3, maxval = 30))
+    begin = perf_counter()
     trans, key = generate_a_puzzle(size)
-    turtle.setup(600,600)
-
-    tiles = display_tiles(-150, size)
-    number_tiles = clone_tiles(tiles)
-    write_numbers(trans, number_tiles)
+    turtle.setup(WINDOW,WINDOW)
+    turtle.tracer(0)
+
+    renderer = TurtleRenderer(size)
+    cache = SolutionCache()
+    game = PuzzleGame(trans, size, renderer, cache)
+    renderer.start(game)
+    print(f"Started in {perf_counter() - begin:.3f}s with "
+          f"{len(turtle.turtles())} turtles and "
+          f"{len(turtle.getcanvas().find_all())} canvas items")
+
+    clicks = deque()
+    last_click = None
+    job, purpose = None, None
+    playback = deque()
+    speed, allowance = SPEED, 0.0
 
     turtle.onscreenclick(set_mouse_click)
+    turtle.onkey(lambda: change_speed(2), "plus")
+    turtle.onkey(lambda: change_speed(2), "equal")
+    turtle.onkey(lambda: change_speed(0.5), "minus")
+    turtle.onkey(cancel_solver, "Escape")
+    turtle.listen()
+    turtle.ontimer(frame_tick, FRAME)
 
     turtle.Screen().mainloop()
@@ -1,36 +1,58 @@
 """
 Here is the data model:
 
-g_snake_tail -> stored in tuple list to represent location
-g_monster -> stored in list[turtle.Turtle]
-g_food -> stored in list[turtle.Turtle]
-
-Note here that specific global variables are set
-in bool type to check the game condition.
+g_engine -> SnakeEngine of snake_engine.py, or SwarmEngine of snake_swarm.py,
+            the whole state of the game in integer cells, with the rules
+            and a seeded random generator
+g_body_items -> stored in deque[int], the canvas rectangle of every segment,
+                moved from the tail to the front instead of stamped again
+g_monster_items -> stored in list[int], the canvas rectangle of every
+                   monster, with g_monster_cells the cells drawn last
+g_food_items -> stored in list[int], the canvas text of every food item,
+                with g_food_cells the cells drawn last
+g_square -> the side of a square, the play area cut into as many squares
+            as the arena has along a side
+
+This file is only the view. A single frame timer reads a monotonic
+clock and plays the time passed with g_engine.step(), which runs the
+snake, the monsters, the food and the time each at its own rate. Then
+everything the engine reports as changed is drawn, and the screen is
+updated at most once per frame, at most --fps frames per second.
+The same engine plays games headless, without turtle, for bots and checks.
+
+The arena, the monsters and the food are set on the command line, up to
+thousands of each. The engine is a SwarmEngine of snake_swarm.py when
+NumPy is installed, with the monsters and the food in arrays, and every
+monster or food item is one canvas item moved only when its cell changed,
+instead of a turtle each.
 """
 
+import argparse
 import turtle
-import random
+from time import perf_counter
+from collections import deque
 from functools import partial
+from snake_engine import FOODS, MONSTERS
+from snake_swarm import new_engine
 
 g_screen = None
 g_intro = None
 g_status = None
+g_status_text = None
+g_last_frame = 0.0
+g_frame_cap = 60
 
+g_engine = None
 g_snake = None
-g_snake_tail = []
-g_snake_sz = 5
-g_monster = []
-g_food = []
-   
-g_key_pressed = None
-g_last_pressed = None
-g_contact = 0
-g_timer = 0
-
-g_is_completed = False
-g_paused = False
-g_blocked = False
+g_body_items = deque()
+g_drawn_advances = 0
+g_monster_items = []
+g_monster_cells = []
+g_food_items = []
+g_food_cells = []
+g_square = 20
+g_grid_left = 0
+g_grid_bottom = 0
 
 COLOR_BODY = ("blue", "black")
 COLOR_HEAD = "red"
@@ -38,8 +60,12 @@ COLOR_MONSTER = "purple"
 
 FONT_INTRO = ("Arial",16,"normal")
 FONT_STATUS = ("Arial",18,"normal")
-TIMER_SNAKES = [300,500]
-TIMER_SNAKE = 300
+
+# frames per second at most unless --fps is given, and the longest time
+# a frame plays in ms, so a stalled window does not rush through seconds
+# of the game at once
+FRAME_CAP = 60
+MAX_FRAME = 250
 
 SZ_SQUARE = 20      
 
@@ -50,7 +76,8 @@ DIM_MARGIN = 30
 KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_SPACE = \
        "Up", "Down", "Left", "Right", "space"
 
-HEADING_BY_KEY = {KEY_UP:90, KEY_DOWN:270, KEY_LEFT:180, KEY_RIGHT:0}
+# the squares along a side of the play area by default
+GRID_SIZE = DIM_PLAY_AREA // SZ_SQUARE
 
 def create_turtle(x:int, y:int, color:str = "red", border:str = "black") \
     -> turtle.Turtle:
@@ -71,48 +98,74 @@ def create_turtle(x:int, y:int, color:str = "red", border:str = "black") \
     t.goto(x, y)
     return t
 
-def initialize_food() -> None:
+def configure_grid(size:int) -> None:
     """
-    Initializes food items at random locations.
-    Here we move the turtle twice to match it with the number.
+    Cuts the play area into size x size squares, centered at
+    (0, -DIM_STAT_AREA//2).
+
+    Args:
+        size (int): The squares along each side of the play area.
     """
 
-    for j in range(5):
-        
-        x_cor = random.choice([random.randrange(-240,-60,20),\
-                               random.randrange(80,240,20)])
-        y_cor = random.choice([random.randrange(-270,-70,20),\
-                               random.randrange(10,210,20)])
+    global g_square, g_grid_left, g_grid_bottom
 
-        food = create_turtle(x_cor, y_cor, "", "black")
-        food.hideturtle()
-        food.goto(x_cor-3, y_cor-10)
-        food.write(str(j+1), font=("Arial",12)) 
-        food.goto(x_cor, y_cor)
-        g_food.append(food)
-    
-def initialize_monster() -> list[turtle.Turtle]:
+    g_square = DIM_PLAY_AREA / size
+    g_grid_left = -DIM_PLAY_AREA/2 + g_square/2
+    g_grid_bottom = -DIM_STAT_AREA//2 - DIM_PLAY_AREA/2 + g_square/2
+
+def cell_center(cell:int) -> tuple[float, float]:
     """
+    Args:
+        cell (int): A cell of the engine.
+
     Returns:
-        list[turtle.Turtle]: List of 4 turtle objects representing the monster.
+        tuple[float, float]: The x and y coordinates of the center of the cell.
     """
 
-    for _ in range(4):
-        
-        x_cor = random.choice([random.randrange(-230,-90,20),\
-                               random.randrange(110,230,20)])
-        y_cor = random.choice([random.randrange(-260,-80,20),\
-                               random.randrange(20,200,20)])
+    return g_grid_left + g_engine.column[cell]*g_square, \
+           g_grid_bottom + g_engine.row[cell]*g_square
 
-        monster = create_turtle(x_cor, y_cor, COLOR_MONSTER, "")
-        g_monster.append(monster)
+def initialize_food() -> None:
+    """
+    Creates a canvas text for every food item where the engine has put it.
+    """
 
-    return g_monster
+    canvas = g_screen.getcanvas()
+    font = ("Arial", max(int(g_square*0.6), 4))
+    for _ in g_engine.food_cells():
+        g_food_items.append(canvas.create_text(0, 0, text="", font=font))
+        g_food_cells.append(None)
+    draw_food()
 
-def configure_play_area() -> tuple[turtle.Turtle, turtle.Turtle]:
+def initialize_monster() -> None:
+    """
+    Creates a canvas rectangle for every monster where the engine has put it.
+    """
+
+    canvas = g_screen.getcanvas()
+    for _ in g_engine.monster_cells():
+        g_monster_items.append(canvas.create_rectangle(
+            0, 0, 0, 0, outline="", fill=COLOR_MONSTER))
+        g_monster_cells.append(None)
+    draw_monsters()
+
+def place_square(item:int, cell:int) -> None:
+    """
+    Args:
+        item (int): The canvas rectangle of a segment or a monster.
+        cell (int): The cell the rectangle covers.
+    """
+
+    x, y = cell_center(cell)
+    half = g_square/2
+    # the canvas counts y downwards, turtle upwards
+    g_screen.getcanvas().coords(item, x-half, -y-half, x+half, -y+half)
+
+def configure_play_area() -> tuple[turtle.Turtle, int]:
     """
     Returns:
-        tuple[turtle.Turtle, turtle.Turtle]: Motion border and status border.
+        tuple[turtle.Turtle, int]: The turtle writing the introduction and
+            the canvas text of the status.
     """
 
     # motion border
@@ -132,10 +185,11 @@ def configure_play_area() -> tuple[turtle.Turtle, turtle.Turtle]:
     intro.hideturtle()
     intro.write("Click anywhere to start!", font=FONT_INTRO)
 
-    # turtle to write status
-    status = create_turtle(0,0,"","black")
-    status.hideturtle()
-    status.goto(-220,s.ycor()-15)
+    # canvas text of the status, changed in place instead of rewritten
+    # the canvas counts y downwards, turtle upwards
+    status = g_screen.getcanvas().create_text(-220, -(s.ycor()-15),
+                                              text="", anchor="sw",
+                                              font=FONT_STATUS)
 
     return intro, status
 
@@ -156,287 +210,133 @@ def configure_screen() -> turtle.Screen:
 
 def update_status():
     """
-    Updates the status display on the screen.
+    Updates the status display on the screen, only if its text changed.
     """
 
-    motion = "Paused" if g_paused == True else g_key_pressed
-    g_status.clear()
-    status = f'Contact:{g_contact}   Time:{g_timer}   Motion:{motion}'
-    g_status.write(status, font=FONT_STATUS)
+    global g_status_text
+
+    text = g_engine.status()
+    if text != g_status_text:
+        g_status_text = text
+        g_screen.getcanvas().itemconfig(g_status, text=text)
 
 def on_key_pressed(key):
     """
     Handles the user's arrow key press event.
-    Then calls the `update_status()` function to update the status.
+    The status is drawn with the next frame.
     
     Args:
-        key (str): One of 'Up', 'Down', 'Left', or 'Right'.
+        key (str): One of 'Up', 'Down', 'Left', 'Right' or 'space'.
     """
 
-    global g_key_pressed, g_last_pressed, g_paused
-
-    if g_is_completed:
-        return
-
-    if key == "space":
-        if g_key_pressed != "space":
-            g_last_pressed = g_key_pressed
-            g_key_pressed = key
-            g_paused = True
-        elif g_key_pressed == "space":
-            g_key_pressed = g_last_pressed
-            g_paused = False
-        update_status()
-        return
-    
-    g_key_pressed = key
-    g_paused = False
-    update_status()
+    g_engine.press(key)
 
-def on_timer_count() -> None:
+def on_frame() -> None:
     """
-    Updates the time. This function is called repeatedly.
+    Plays the time passed since the last frame and draws what changed.
+    This function is called repeatedly until the game is completed.
     """
 
-    global g_timer
+    global g_last_frame
 
-    if g_is_completed:
-        return
+    now = perf_counter()
+    dt = min((now - g_last_frame) * 1000, MAX_FRAME)
+    g_last_frame = now
 
-    g_timer += 1
-    update_status()
-    g_screen.ontimer(on_timer_count,1000)
+    draw_changes(g_engine.step(dt))
 
-def on_timer_snake() -> None:
-    """
-    Advances the snake's movement. This function is called repeatedly.
-    
-    If no key has been pressed or the snake is paused or blocked, 
-    the function simply schedules itself to be called again.
-    If the game has been completed, the function simply returns.
-    Otherwise, it performs the following steps:
-    
-    1. Clones the snake's head as a new body segment.
-    2. Advances the snake's position by setting the heading based 
-        on the last key pressed (`g_key_pressed`) and 
-        moving the snake forward by `SZ_SQUARE` units.
-    3. If the snake's head is on top of the food, the food is consumed.
-    4. If the snake has consumed all food items, the game is completed.
-    5. If the number of stamped segments exceeds the current snake size, 
-        removes the last segment by clearing the oldest stamp.
-    6. Updates the Turtle screen to reflect the changes.
-    7. Schedules the function to be called again.
-    """
+    if g_engine.over is None:
+        # wait out the rest of the frame
+        spent = (perf_counter() - now) * 1000
+        g_screen.ontimer(on_frame, max(int(1000/g_frame_cap - spent), 1))
 
-    global TIMER_SNAKE, g_blocked, g_is_completed
-
-    if g_is_completed:
-        return
-
-    x,y = g_snake.pos()
-    if over_boundary(x, y, "snake", g_key_pressed):
+def draw_changes(changed:set) -> None:
+    """
+    Draws everything the engine reports as changed, then updates the
+    screen once.
 
-        g_blocked = True
-        g_screen.ontimer(on_timer_snake, TIMER_SNAKE)
-        return
-    g_blocked = False
+    Args:
+        changed (set): What changed, as told by the engine.
+    """
 
-    if g_paused or g_blocked or (g_key_pressed is None):
-        g_screen.ontimer(on_timer_snake, TIMER_SNAKE)
+    if not changed:
         return
-    
-    # Clone the head as body
-    g_snake.color(*COLOR_BODY)
-    g_snake.stamp()
-    g_snake_tail.append(g_snake.pos())
-    g_snake.color(COLOR_HEAD)
-
-    # Advance snake
-    g_snake.setheading( HEADING_BY_KEY[g_key_pressed] )
-    g_snake.forward(SZ_SQUARE)
-    
-    # Consume food if needed
-    consume_food()
-    
-    # Judge the game condition
-    if (len(g_snake.stampItems) == 20) and g_snake_sz == 20:
-        finish_game("winner")
-        g_is_completed = True
-
-    # Shifting or extending the tail
-    # Remove the last square on Shifting
-    if len(g_snake.stampItems) > g_snake_sz:
-        g_snake.clearstamps(1)
-        g_snake_tail.pop(0)
-        TIMER_SNAKE = TIMER_SNAKES[0]
-    else:
-        TIMER_SNAKE = TIMER_SNAKES[1]
 
+    if "snake" in changed:
+        draw_snake()
+    if "monsters" in changed:
+        draw_monsters()
+    if "food" in changed:
+        draw_food()
+    if "status" in changed:
+        update_status()
+    if "over" in changed:
+        finish_game(g_engine.over)
     g_screen.update()
-    g_screen.ontimer(on_timer_snake, TIMER_SNAKE)
-
 
-def on_timer_monster() -> None:
+def draw_monsters() -> None:
     """
-    Advances the monster's movement. This function is called repeatedly.
-    
-    The function performs the following steps:
-    
-    1. If the monster collides with the head of snake, the game is over.
-    2. Increases the g_contact if needed.
-    3. Calculates the heading for the monster to move towards the snake.
-    4. Sets the monster's heading to the calculated value.
-    5. Moves the monster forward by `SZ_SQUARE` units.
-    6. Updates the Turtle screen to reflect the changes.
-    7. Schedules the function to be called again after a random delay 
-        between `TIMER_SNAKE-100` and `TIMER_SNAKE+100` milliseconds.
+    Moves the rectangle of every monster whose cell changed since the last
+    draw, the others are left alone.
     """
 
-    global g_is_completed
-    
-    if g_is_completed:
-        return
-    
-    for monster in g_monster:
-
-        # Judge the condition
-        if monster.distance(g_snake) < SZ_SQUARE:
-            finish_game("loser")
-            g_is_completed = True
-            return
-        
-        # Increase contact if needed
-        is_contact(monster)
-        
-        # Calculate the heading
-        angle = monster.towards(g_snake)
-        qtr = angle//45
-        vib = random.choice([-1,1])
-        heading = qtr * 45 if qtr % 2 == 0 else (qtr+vib) * 45
-
-        monster.setheading(heading)
-        x,y = monster.pos()
-        if not over_boundary(x, y, "monster", heading):
-            monster.forward(SZ_SQUARE)
-
-    g_screen.update()
-    delay = random.randint(TIMER_SNAKE-100, TIMER_SNAKE+100)
-    g_screen.ontimer(on_timer_monster, delay)
+    for j, cell in enumerate(g_engine.monster_cells()):
+        if cell != g_monster_cells[j]:
+            g_monster_cells[j] = cell
+            place_square(g_monster_items[j], cell)
 
-def on_timer_food() -> None:
+def draw_food() -> None:
     """
-    Shifts the food items. This function is called repeatedly.
-
-    The function performs the following steps:
-    
-    1. If the game is completed, the function simply returns.
-    2. Randomly choose the number of existing food items to shift.
-    3. Select the food items needed to be shifted and add them to a list.
-    4. Shift the selected food to a random place.
-    5. Updates the Turtle screen to reflect the changes.
-    6. Schedules the function to be called again after a random delay.
+    Moves the text of every food item whose cell changed since the last
+    draw, and empties it once the item is eaten.
     """
 
-    if g_is_completed:
-        return
-    
-    cnt = 0
-    shifter = 0
-    shift_food = []
-
-    if g_snake_sz == 20:
-        return
-    
-    # Randomly choose the shifted food number
-    for food in g_food:
-        cnt += 1 if food != None else 0
-    num_shift = random.randint(1,cnt)
-    
-    # Select the food items needed to be shifted
-    while shifter < num_shift:
-        for food in g_food:
-            if food != None:
-                g_food[g_food.index(food)].clear()
-                shift_food.append(food)
-                shifter += 1
-    
-    # Shift the food
-    for shifter in shift_food:
-
-        x,y = shifter.pos()
-        while True:
-            del_x = random.randint(-2,2) * SZ_SQUARE
-            del_y = random.randint(-2,2) * SZ_SQUARE
-            if x+del_x >=-230 and x+del_x <= 230 and\
-                  y+del_y >= -260 and y+del_y <= 200:
-                break
-        shifter.goto(x+del_x-3, y+del_y-10)
-        shifter.write(str(g_food.index(shifter)+1), font=("Arial",12))
-        shifter.goto(x+del_x, y+del_y)
-
-    g_screen.update()
-    delay = random.randint(5000, 10000)
-    g_screen.ontimer(on_timer_food, delay)
-        
-def consume_food() -> None:
+    canvas = g_screen.getcanvas()
+    for j, cell in enumerate(g_engine.food_cells()):
+        if cell == g_food_cells[j]:
+            continue
+        g_food_cells[j] = cell
+        if cell is None:
+            canvas.itemconfig(g_food_items[j], text="")
+            continue
+        x, y = cell_center(cell)
+        # the canvas counts y downwards, turtle upwards
+        canvas.coords(g_food_items[j], x, -y)
+        canvas.itemconfig(g_food_items[j], text=str(g_engine.number(j)))
+
+def draw_snake() -> None:
     """
-    Modifies:
-        g_snake_sz (int): Increments the size of the snake's body if needed.
+    Moves the head, and for every cell the head has left since the last
+    draw, moves the last segment there, or creates one if the snake grew.
     """
 
-    global g_snake_sz
+    global g_drawn_advances
 
-    for food in g_food:
-        if food and food.distance(g_snake) < (SZ_SQUARE/2):
-            g_food[g_food.index(food)].clear()
-            g_snake_sz += g_food.index(food)+1
-            g_food[g_food.index(food)] = None
+    body = g_engine.body
+    g_snake.goto(*cell_center(g_engine.head))
+    moved = min(g_engine.advances - g_drawn_advances, len(body))
+    g_drawn_advances = g_engine.advances
 
-def over_boundary(x:float, y:float, case:str, direction) -> bool:
-    """
-    Args:
-        x (float): The x coordinate of the object.
-        y (float): The y coordinate of the object.
-        case (str): The object type.
-        direction: The direction of the object. Either string or integer.
+    for i in range(len(body) - moved, len(body)):
+        if len(g_body_items) >= len(body):
+            item = g_body_items.popleft()
+        else:
+            item = create_segment()
+        place_square(item, body[i])
+        g_body_items.append(item)
 
-    Returns:
-        True if the object is out of the boundary, otherwise False.
-    """
-
-    if case == "snake":
-        if (direction == "Up" and y > 200) or\
-           (direction == "Down" and y < -260) or\
-           (direction == "Left" and x < -230) or\
-           (direction == "Right" and x > 230):
-            return True
-        return False
-
-    if case == "monster":
-        if (x < -220 and direction == 180) or \
-           (x > 220 and direction == 0) or \
-           (y < -250 and direction == 270) or \
-           (y > 190 and direction == 90):
-            return True
-        return False
-        
-def is_contact(monster: turtle.Turtle) -> None:
+def create_segment() -> int:
     """
-    Args:
-        monster (turtle.Turtle): The monster to check.
+    Returns:
+        int: A new canvas rectangle for a body segment, below the turtles.
     """
 
-    global g_contact
+    canvas = g_screen.getcanvas()
+    item = canvas.create_rectangle(0, 0, 0, 0, outline=COLOR_BODY[0],
+                                   fill=COLOR_BODY[1])
+    canvas.tag_lower(item)
+    return item
 
-    for i in range(len(g_snake_tail)):
-        x_snake, y_snake = g_snake_tail[i]
-        x_monster, y_monster = monster.pos()
-        distance_sq = (x_snake-x_monster)**2 + (y_snake-y_monster)**2
-        if distance_sq < SZ_SQUARE**2:
-            g_contact += 1
-            update_status()
-            return
-        
 def finish_game(case:str) -> None:
     """
     Args:
@@ -461,32 +361,52 @@ def start_game(x:float, y:float):
         y (float): The y coordinate of the mouse click.
     """
 
-    global g_timer
+    global g_last_frame
 
     g_screen.onscreenclick(None)
     g_intro.clear()
     initialize_food()
 
-    on_timer_count()
-    on_timer_snake()
-    on_timer_monster()
-    on_timer_food()
+    g_last_frame = perf_counter()
+    on_frame()
 
     for key in (KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_LEFT, KEY_SPACE):
         g_screen.onkey(partial(on_key_pressed,key), key)
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Snake by Willow")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="squares along each side of the play area")
+    parser.add_argument("--monsters", type=int, default=MONSTERS)
+    parser.add_argument("--foods", type=int, default=FOODS)
+    parser.add_argument("--seed", type=int, help="seed of the game")
+    parser.add_argument("--fps", type=int, default=FRAME_CAP,
+                        help="frames per second at most")
+    args = parser.parse_args()
+    if args.fps < 1:
+        parser.error("The frame cap must be at least 1 fps!")
+    g_frame_cap = args.fps
+
+    try:
+        g_engine = new_engine(args.seed, columns=args.size, rows=args.size,
+                              monsters=args.monsters, foods=args.foods)
+    except ValueError as err_msg:
+        parser.error(str(err_msg))
+    configure_grid(args.size)
+
     g_screen = configure_screen()
     g_intro, g_status = configure_play_area()
 
     update_status()
 
-    g_monster = initialize_monster()
-    g_snake = create_turtle(0,-30, COLOR_HEAD, "")
+    initialize_monster()
+    g_snake = create_turtle(*cell_center(g_engine.head), COLOR_HEAD, "")
+    g_snake.shapesize(g_square / SZ_SQUARE)
 
     g_screen.onscreenclick(start_game) # set up a mouse-click call back
 
     g_screen.update()
     g_screen.listen()
     g_screen.mainloop()
+
@@ -0,0 +1,307 @@
+'''
+Here are the pattern databases for the 4x4 and 5x5 puzzles.
+
+A pattern is a group of tiles, for example 1, 5, 6, 9, 10 and 13.
+Its database stores, for every way of placing these tiles on the board,
+the least number of moves of these tiles needed to bring them home.
+The other tiles are ignored, so moving them costs nothing.
+As the groups do not share tiles, the values of all groups can be added
+and the sum never overestimates the real number of moves.
+
+Data model:
+
+Placement -> the cells of the pattern tiles in group order
+Rank -> a placement numbered from 0 to n!/(n-k)! - 1 (n cells, k tiles)
+Table -> one byte per rank in a file, read through mmap without copying
+
+The table is built by a breadth first search from the final state.
+While building, a work file keeps one byte per (rank, blank cell),
+255 for "not reached yet", and a small layer file keeps the depth in
+progress. Every layer only reads the work file, so an interrupted build
+is resumed by searching the layer in progress again.
+
+Build the tables once from the command line:
+    python pattern_database.py --size 4
+'''
+
+import argparse
+import mmap
+import os
+from math import perm
+from puzzle_state import move_table
+
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+DEFAULT_GROUPS = {
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20),
+        (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)),
+}
+
+UNREACHED = 255
+
+def rank(placement:list, cells:int) -> int:
+    '''
+    Parameters:
+        placement (list): The cells of the pattern tiles in group order
+        cells (int): The number of cells on the board
+
+    Return:
+        Returns the rank of the placement
+    '''
+    result = 0
+    for i, cell in enumerate(placement):
+        smaller = 0
+        for j in range(i):
+            if placement[j] < cell:
+                smaller += 1
+        result = result * (cells-i) + cell - smaller
+    return result
+
+def unrank(number:int, tiles:int, cells:int) -> list:
+    '''
+    Parameters:
+        number (int): The rank of the placement
+        tiles (int): The number of tiles in the pattern
+        cells (int): The number of cells on the board
+
+    Return:
+        Returns the placement in list form
+    '''
+    digits = []
+    for i in range(tiles-1, -1, -1):
+        number, digit = divmod(number, cells-i)
+        digits.append(digit)
+    free = list(range(cells))
+    return [free.pop(digit) for digit in reversed(digits)]
+
+def table_path(size:int, group:tuple, directory:str=DIRECTORY) -> str:
+    '''
+    Parameters:
+        size (int): The size of the board
+        group (tuple): The tiles of the pattern
+        directory (str): Where the tables are stored
+
+    Return:
+        Returns the path of the table file
+    '''
+    name = f"pdb_{size}x{size}_" + "-".join(str(t) for t in group)
+    return os.path.join(directory, name + ".bin")
+
+def _neighbors(size:int) -> list:
+    moves = move_table(size).values()
+    return [[cells[cell] for cells in moves if cells[cell] >= 0]
+            for cell in range(size**2)]
+
+def _search_layer(work:mmap.mmap, depth:int, size:int, tiles:int,
+                  neighbors:list) -> None:
+    # Expand every state of the given depth. Blank moves over other
+    # tiles cost nothing, so they are flooded inside the same rank.
+    cells = size**2
+    mark = bytes([depth])
+    position = work.find(mark)
+    while position != -1:
+        number = position // cells
+        base = number * cells
+        placement = unrank(number, tiles, cells)
+        owner = [-1] * cells
+        for i, cell in enumerate(placement):
+            owner[cell] = i
+
+        stack = [cell for cell in range(cells)
+                 if work[base+cell] == depth]
+        while stack:
+            blank = stack.pop()
+            for cell in neighbors[blank]:
+                i = owner[cell]
+                if i < 0:
+                    if work[base+cell] > depth:
+                        work[base+cell] = depth
+                        stack.append(cell)
+                    continue
+                placement[i] = blank
+                index = rank(placement, cells) * cells + cell
+                placement[i] = cell
+                if work[index] == UNREACHED:
+                    work[index] = depth + 1
+
+        position = work.find(mark, base + cells)
+
+def build(size:int, group:tuple, directory:str=DIRECTORY,
+          report=print) -> str:
+    '''
+    Parameters:
+        size (int): The size of the board
+        group (tuple): The tiles of the pattern
+        directory (str): Where the tables are stored
+        report: A function that takes the progress messages
+
+    Return:
+        Returns the path of the finished table file
+    '''
+    path = table_path(size, group, directory)
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+
+    cells, tiles = size**2, len(group)
+    entries = perm(cells, tiles)
+    work_path, layer_path = path + ".work", path + ".layer"
+
+    if os.path.exists(work_path) and os.path.exists(layer_path):
+        with open(layer_path) as f:
+            depth = int(f.read())
+        report(f"{os.path.basename(path)}: resuming at depth {depth}")
+    else:
+        with open(work_path, "wb") as f:
+            f.truncate(entries * cells)
+        with open(work_path, "r+b") as f, \
+             mmap.mmap(f.fileno(), 0) as work:
+            work.write(bytes([UNREACHED]) * len(work))
+            goal = rank([t-1 for t in group], cells)
+            work[goal*cells + cells-1] = 0
+        depth = 0
+
+    with open(work_path, "r+b") as f, mmap.mmap(f.fileno(), 0) as work:
+        neighbors = _neighbors(size)
+        while True:
+            with open(layer_path, "w") as layer:
+                layer.write(str(depth))
+            report(f"{os.path.basename(path)}: depth {depth}")
+            _search_layer(work, depth, size, tiles, neighbors)
+            work.flush()
+            # ask the table, not the layer: a layer searched again after
+            # an interruption finds its deeper states already set
+            if work.find(bytes([depth + 1])) == -1:
+                break
+            depth += 1
+
+        # keep the best value over all blank cells of every rank
+        with open(path + ".part", "wb") as table:
+            for start in range(0, entries, 1 << 16):
+                stop = min(start + (1 << 16), entries)
+                table.write(bytes(min(work[r*cells:(r+1)*cells])
+                                  for r in range(start, stop)))
+
+    os.replace(path + ".part", path)
+    os.remove(work_path)
+    os.remove(layer_path)
+    return path
+
+def load(size:int, group:tuple, directory:str=DIRECTORY) -> mmap.mmap:
+    '''
+    Parameters:
+        size (int): The size of the board
+        group (tuple): The tiles of the pattern
+        directory (str): Where the tables are stored
+
+    Return:
+        Returns the table mapped read only into memory
+    '''
+    with open(table_path(size, group, directory), "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def available(size:int, groups:tuple=None,
+              directory:str=DIRECTORY) -> bool:
+    '''
+    Parameters:
+        size (int): The size of the board
+        groups (tuple): The patterns, defaults to DEFAULT_GROUPS[size]
+        directory (str): Where the tables are stored
+
+    Return:
+        Returns True if every table of the patterns has been built
+    '''
+    groups = groups or DEFAULT_GROUPS.get(size)
+    if not groups:
+        return False
+    return all(os.path.exists(table_path(size, group, directory))
+               for group in groups)
+
+class PatternHeuristic:
+    '''
+    The sum of disjoint pattern databases, updated move by move.
+    It has the same reset() and move() as puzzle_solver.ManhattanConflict.
+    '''
+
+    def __init__(self, size:int, groups:tuple=None,
+                 directory:str=DIRECTORY):
+        '''
+        Parameters:
+            size (int): The size of the board, 4 or 5 by default
+            groups (tuple): The patterns, defaults to DEFAULT_GROUPS[size]
+            directory (str): Where the tables are stored
+        '''
+        self.size = size
+        self.groups = groups or DEFAULT_GROUPS[size]
+        self.tables = [load(size, group, directory) for group in self.groups]
+        # which group and which place in the group every tile belongs to
+        self.group_of = [-1] * size**2
+        self.index_of = [-1] * size**2
+        for g, group in enumerate(self.groups):
+            for i, tile in enumerate(group):
+                self.group_of[tile] = g
+                self.index_of[tile] = i
+
+    def reset(self, tiles:list) -> int:
+        '''
+        Parameters:
+            tiles (list): The puzzle with blank as 0
+
+        Return:
+            Returns the estimate for the whole puzzle
+        '''
+        cells = self.size**2
+        self.placements = [[0] * len(group) for group in self.groups]
+        for cell, tile in enumerate(tiles):
+            if tile and self.group_of[tile] >= 0:
+                self.placements[self.group_of[tile]][self.index_of[tile]] = cell
+        self.values = [table[rank(p, cells)]
+                       for table, p in zip(self.tables, self.placements)]
+        self.total = sum(self.values)
+        return self.total
+
+    def move(self, tile:int, source:int, target:int) -> int:
+        '''
+        Parameters:
+            tile (int): The tile that has just been moved
+            source, target (int): The cells it moved from and to
+
+        Return:
+            Returns the estimate after the move
+        '''
+        g = self.group_of[tile]
+        if g < 0:
+            return self.total
+        placement = self.placements[g]
+        placement[self.index_of[tile]] = target
+        value = self.tables[g][rank(placement, self.size**2)]
+        self.total += value - self.values[g]
+        self.values[g] = value
+        return self.total
+
+def _parse_groups(text:str) -> tuple:
+    return tuple(tuple(int(t) for t in part.split(","))
+                 for part in text.split("/"))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the pattern databases, resuming if interrupted.")
+    parser.add_argument("--size", type=int, default=4, choices=(3, 4, 5))
+    parser.add_argument("--groups", type=_parse_groups, default=None,
+                        help="tiles of every pattern, e.g. 1,2,3/4,5,6,7,8")
+    parser.add_argument("--directory", default=DIRECTORY)
+    args = parser.parse_args()
+
+    groups = args.groups or DEFAULT_GROUPS.get(args.size)
+    if not groups:
+        parser.error(f"no default patterns for size {args.size}")
+    tiles = sorted(t for group in groups for t in group)
+    if len(tiles) != len(set(tiles)) or \
+       not all(1 <= t < args.size**2 for t in tiles):
+        parser.error("patterns should not share tiles")
+    for group in groups:
+        print("built", build(args.size, group, args.directory))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+'''
+Here is the batch solver for large collections of puzzles.
+
+Every line of the input file is one puzzle, read from left to right,
+top to bottom, either as a JSON list such as [1, 2, 3, 4, 5, 6, 7, " ", 8]
+or as numbers separated by spaces with 0 for the blank.
+The size is taken from the number of cells. A line that is not a puzzle
+gets an error as its result, like a puzzle that is not solvable, and the
+batch goes on.
+
+The puzzles are cut into chunks and solved by a pool of processes,
+one per core by default. Every process opens the pattern databases of
+pattern_database.py itself; as they are memory mapped files, all
+processes share the same pages of memory and nothing is pickled.
+Only a limited number of chunks is in flight at a time, so a file of a
+million puzzles is never held in memory as a whole.
+
+The results are written in the order of the input, one JSON object per
+line, with the solution length, the expanded nodes and the wall time:
+    python puzzle_batch.py puzzles.txt -o results.jsonl
+'''
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+from puzzle_solver import default_heuristic, search
+
+# the heuristic of every size, opened once in every process
+_heuristics = {}
+
+def parse_puzzle(line:str) -> list:
+    '''
+    Parameters:
+        line (str): One line of the input file
+
+    Return:
+        Returns the puzzle in list form with the blank as 0
+    '''
+    line = line.strip()
+    try:
+        if line.startswith("["):
+            board = [0 if t == " " else int(t) for t in json.loads(line)]
+        else:
+            board = [int(t) for t in line.split()]
+    except (TypeError, ValueError):
+        raise ValueError("Every tile should be a number!") from None
+    size = int(round(len(board) ** 0.5))
+    if size < 2 or size * size != len(board):
+        raise ValueError(f"The puzzle has {len(board)} cells, not a square!")
+    if sorted(board) != list(range(len(board))):
+        raise ValueError("The tiles should be 1 to n*n-1 and a blank!")
+    return board
+
+def solve_one(board:list) -> dict:
+    '''
+    Parameters:
+        board (list): The puzzle in list form with the blank as 0
+
+    Return:
+        Returns the result of the puzzle in dictionary form
+    '''
+    size = int(round(len(board) ** 0.5))
+    if size not in _heuristics:
+        _heuristics[size] = default_heuristic(size)
+    start = perf_counter()
+    try:
+        moves, nodes = search(board, size, _heuristics[size])
+    except ValueError as err_msg:
+        return {"error": str(err_msg)}
+    return {"length": len(moves), "nodes": nodes,
+            "time": round(perf_counter() - start, 6),
+            "moves": " ".join(moves)}
+
+def solve_line(line:str) -> dict:
+    '''
+    Parameters:
+        line (str): One line of the input file
+
+    Return:
+        Returns the result of the puzzle in dictionary form, an error
+        if the line is not a puzzle
+    '''
+    try:
+        board = parse_puzzle(line)
+    except ValueError as err_msg:
+        return {"error": str(err_msg)}
+    return solve_one(board)
+
+def solve_chunk(lines:list) -> list:
+    '''
+    Parameters:
+        lines (list): Lines of the input file
+
+    Return:
+        Returns the results of the puzzles in list form
+    '''
+    return [solve_line(line) for line in lines]
+
+def solve_stream(lines, workers:int=None, chunk:int=16):
+    '''
+    Parameters:
+        lines: An iterable of lines, each holding one puzzle
+        workers (int): The number of processes, defaults to the cores
+        chunk (int): The number of puzzles sent to a process at a time
+
+    Return:
+        Yields the results in the order of the lines
+    '''
+    workers = workers or os.cpu_count() or 1
+    lines = (line for line in lines if line.strip())
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            # keep every process busy with a few chunks in reserve
+            while len(pending) < workers * 4:
+                part = list(islice(lines, chunk))
+                if not part:
+                    break
+                pending.append(pool.submit(solve_chunk, part))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Solve a file of puzzles on all cores as JSON lines.")
+    parser.add_argument("puzzles", help="the input file, - for stdin")
+    parser.add_argument("-o", "--output", help="the output file, \
+defaults to stdout")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=16)
+    parser.add_argument("--no-moves", action="store_true",
+                        help="leave the moves out of the results")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.puzzles == "-" else open(args.puzzles)
+    target = open(args.output, "w") if args.output else sys.stdout
+    start = perf_counter()
+    count = 0
+    try:
+        for index, result in enumerate(solve_stream(source, args.workers,
+                                                    args.chunk)):
+            if args.no_moves:
+                result.pop("moves", None)
+            target.write(json.dumps({"index": index, **result}) + "\n")
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    spent = perf_counter() - start
+    print(f"Solved {count} puzzles in {spent:.2f}s, "
+          f"{count / spent:.1f} puzzles/s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
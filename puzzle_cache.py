@@ -0,0 +1,173 @@
+'''
+Here is the cache of optimal solutions.
+
+Solving the same puzzle twice is a waste, whether it is asked for a hint
+again and again while playing or found again in a regression collection.
+The cache has two levels:
+
+a. memory: the most recently used solutions in an OrderedDict,
+   the least recently used are dropped beyond a memory limit
+b. disk: every solution in a SQLite file, kept between runs
+
+The key is the packed board of puzzle_state.py, so equal boards always
+share one entry. A solution is stored with one letter per move (l, r, u
+or d). As every part of an optimal solution is optimal too, all boards
+along the solution are stored at once, and following the hints never
+needs a second search.
+
+Hits of both levels and misses are counted in stats.
+'''
+
+import os
+import sqlite3
+from collections import OrderedDict
+from puzzle_engine import MoveEngine
+from puzzle_solver import search
+from puzzle_state import PuzzleState
+
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+PATH = os.path.join(DIRECTORY, "solutions.sqlite")
+
+# rough cost of one entry in memory besides its key and moves
+ENTRY_OVERHEAD = 200
+
+NAMES = {"l": "left", "r": "right", "u": "up", "d": "down"}
+
+class SolutionCache:
+    '''
+    Optimal solutions, cached in memory and on disk.
+    '''
+
+    def __init__(self, path:str=PATH, memory_limit:int=32 << 20):
+        '''
+        Parameters:
+            path (str): The SQLite file, None to keep everything in memory
+            memory_limit (int): The memory the first level may take in bytes
+        '''
+        self.memory_limit = memory_limit
+        self.memory = OrderedDict()
+        self.memory_used = 0
+        self.stats = {"memory hits": 0, "disk hits": 0, "misses": 0}
+        if path is None:
+            path = ":memory:"
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                        "size INTEGER, board BLOB, moves TEXT, "
+                        "PRIMARY KEY (size, board)) WITHOUT ROWID")
+
+    def _remember(self, key:tuple, moves:str) -> None:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = moves
+        self.memory_used += len(key[1]) + len(moves) + ENTRY_OVERHEAD
+        while self.memory_used > self.memory_limit and self.memory:
+            (_, board), old = self.memory.popitem(last=False)
+            self.memory_used -= len(board) + len(old) + ENTRY_OVERHEAD
+
+    def get(self, state:PuzzleState) -> str:
+        '''
+        Parameters:
+            state (PuzzleState): The puzzle
+
+        Return:
+            Returns the solution in letters, or None if it is not cached
+        '''
+        key = (state.size, state.key())
+        moves = self.memory.get(key)
+        if moves is not None:
+            self.memory.move_to_end(key)
+            self.stats["memory hits"] += 1
+            return moves
+        row = self.db.execute("SELECT moves FROM solutions "
+                              "WHERE size = ? AND board = ?", key).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk hits"] += 1
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, state:PuzzleState, moves:list) -> None:
+        '''
+        Parameters:
+            state (PuzzleState): The puzzle
+            moves (list): Its optimal solution in list form
+        '''
+        engine = MoveEngine(state.to_list(), state.size)
+        letters = "".join(m[0] for m in moves)
+        rows = []
+        for i, move in enumerate(moves):
+            key = (state.size, engine.state().key())
+            self._remember(key, letters[i:])
+            rows.append((*key, letters[i:]))
+            engine.move(move)
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO solutions "
+                                "VALUES (?, ?, ?)", rows)
+
+    def letters(self, board:list, size:int) -> str:
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be 3, 4 or 5
+
+        Return:
+            Returns the optimal moves in letters, solving if needed
+        '''
+        state = PuzzleState.from_list(board, size)
+        if state.is_solved():
+            return ""
+        letters = self.get(state)
+        if letters is None:
+            moves, _ = search(board, size)
+            self.put(state, moves)
+            letters = "".join(m[0] for m in moves)
+        return letters
+
+    def solution(self, board:list, size:int) -> list:
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be 3, 4 or 5
+
+        Return:
+            Returns the optimal moves in list form, solving if needed
+        '''
+        return [NAMES[letter] for letter in self.letters(board, size)]
+
+    def next_move(self, board:list, size:int) -> str:
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be 3, 4 or 5
+
+        Return:
+            Returns "left", "right", "up" or "down", or None if solved
+        '''
+        letters = self.letters(board, size)
+        return NAMES[letters[0]] if letters else None
+
+    def cached_move(self, board:list, size:int) -> str:
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be 3, 4 or 5
+
+        Return:
+            Returns "left", "right", "up" or "down" if the solution is
+            cached, None otherwise, never searching
+        '''
+        state = PuzzleState.from_list(board, size)
+        if state.is_solved():
+            return None
+        letters = self.get(state)
+        return NAMES[letters[0]] if letters else None
+
+    def close(self) -> None:
+        '''
+        Closes the SQLite file.
+        '''
+        self.db.close()
@@ -0,0 +1,142 @@
+'''
+Here is the core shared by A1 and A2.
+
+Data model:
+
+Layout -> everything about a size that never changes, computed once
+    goal: the ordered puzzle, read from left to right, top to bottom, blank 0
+    display: the cell shown at every place of A2, which lists the puzzle
+             from bottom to top; the table is its own inverse
+    display_goal: the ordered puzzle in the display order of A2, blank " "
+    coordinates: the [x, y] coordinate of every cell, both counted from 1
+    move_of: for every blank cell, the move that slides in each neighbour
+Board -> a MoveEngine from puzzle_engine.py that knows its Layout
+    It is always kept from left to right, top to bottom, and changes
+    order only through the display table, one lookup per cell.
+
+So the front ends never reorder a puzzle with nested loops, and a click
+or a move costs a few table lookups whatever the orientation.
+
+layout() -> the Layout of a size, cached
+Board.random() -> a random solvable puzzle, from generate_solvable()
+Board.from_display() / display_list() -> to and from the order of A2
+'''
+
+import random
+from functools import lru_cache
+from puzzle_engine import MoveEngine
+from puzzle_generator import generate_solvable
+from puzzle_state import MOVES, move_table
+
+class Layout:
+    '''
+    The tables of one size, shared by every board of that size.
+    '''
+
+    __slots__ = ("size", "goal", "display", "display_goal", "coordinates",
+                 "move_of")
+
+    def __init__(self, size:int):
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+        '''
+        cells = range(size**2)
+        self.size = size
+        self.goal = tuple(range(1, size**2)) + (0,)
+        # the row is counted from the bottom, the column stays
+        self.display = tuple((size-1 - i//size)*size + i%size for i in cells)
+        self.display_goal = tuple(self.goal[c] or " " for c in self.display)
+        self.coordinates = tuple((c%size + 1, c//size + 1) for c in cells)
+        table = move_table(size)
+        self.move_of = tuple({table[m][c]: m for m in MOVES if table[m][c] >= 0}
+                             for c in cells)
+
+@lru_cache(maxsize=None)
+def layout(size:int) -> Layout:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns the Layout of the size, computed only the first time
+    '''
+    return Layout(size)
+
+class Board(MoveEngine):
+    '''
+    A puzzle in play, with the tables of its size at hand.
+    '''
+
+    __slots__ = ("layout",)
+
+    def __init__(self, board:list, size:int):
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0,
+                read from left to right, top to bottom
+            size (int): An integer suggested to be >= 3
+        '''
+        super().__init__(board, size)
+        self.layout = layout(size)
+
+    @classmethod
+    def random(cls, size:int, rng:random.Random=None) -> "Board":
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+            rng (random.Random): The random generator, defaults to random
+
+        Return:
+            Returns a random solvable puzzle
+        '''
+        return cls(generate_solvable(size, rng), size)
+
+    @classmethod
+    def from_display(cls, position_list:list, size:int) -> "Board":
+        '''
+        Parameters:
+            position_list (list): The puzzle in the order of A2
+            size (int): An integer suggested to be >= 3
+
+        Return:
+            Returns the puzzle as a board
+        '''
+        display = layout(size).display
+        return cls([position_list[i] for i in display], size)
+
+    def display_list(self) -> list:
+        '''
+        Return:
+            Returns the puzzle in the order of A2, blank as " "
+        '''
+        tiles = self.tiles
+        return [tiles[i] or " " for i in self.layout.display]
+
+    def locate_blank(self) -> list:
+        '''
+        Return:
+            Returns the [x, y] coordinate of the blank, both counted from 1
+        '''
+        return list(self.layout.coordinates[self.blank])
+
+    def move_name(self, cell:int) -> str:
+        '''
+        Parameters:
+            cell (int): The cell of the tile to slide
+
+        Return:
+            Returns the move that slides the tile into the blank,
+            or None if the tile is not next to the blank
+        '''
+        return self.layout.move_of[self.blank].get(cell)
+
+    def source(self, name:str) -> int:
+        '''
+        Parameters:
+            name (str): "left", "right", "up" or "down"
+
+        Return:
+            Returns the cell of the tile the move slides, -1 if not proper
+        '''
+        return move_table(self.size)[name][self.blank]
@@ -0,0 +1,133 @@
+'''
+Here is the move engine used while a puzzle is being played.
+
+Data model:
+
+MoveEngine -> size, tiles, blank cell and number of misplaced tiles
+    tiles: array of cells, read from left to right, top to bottom, blank 0
+
+Everything a move needs is known without looking at the whole board:
+a. the blank cell is kept, so it is never searched for
+b. only the moved tile can change its place, so the number of misplaced
+   tiles is updated by looking at that tile only,
+   and the puzzle is solved exactly when it is 0
+c. the proper moves of every blank cell are precomputed once per size
+   as a 4 bit mask in a bytearray, one byte per cell
+
+So a move costs the same on a 1000x1000 board as on a 3x3 one.
+
+Unlike a PuzzleState from puzzle_state.py, the engine changes in place;
+state() takes a hashable snapshot when one is needed.
+'''
+
+from array import array
+from functools import lru_cache
+from puzzle_state import MOVES, PuzzleState
+
+# bit of every move in the mask of a blank cell
+LEFT, RIGHT, UP, DOWN = 1, 2, 4, 8
+BITS = (LEFT, RIGHT, UP, DOWN)
+
+# the names of the proper moves of every mask
+NAMES = tuple(tuple(m for m, bit in zip(MOVES, BITS) if mask & bit)
+              for mask in range(16))
+
+@lru_cache(maxsize=None)
+def move_masks(size:int) -> bytearray:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns the mask of proper moves of every blank cell
+    '''
+    if size == 1:
+        return bytearray(1)
+    row = bytearray([LEFT | RIGHT]) * size
+    row[0], row[-1] = LEFT, RIGHT
+    first = bytes(b | UP for b in row)
+    middle = bytes(b | UP | DOWN for b in row)
+    last = bytes(b | DOWN for b in row)
+    return bytearray(first + middle * (size-2) + last)
+
+class MoveEngine:
+    '''
+    A puzzle in play, with O(1) moves and O(1) solved detection.
+    '''
+
+    __slots__ = ("size", "tiles", "blank", "misplaced", "masks", "steps")
+
+    def __init__(self, board:list, size:int):
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be >= 3
+        '''
+        numbers = [0 if t == " " else t for t in board]
+        self.size = size
+        self.tiles = array("I", numbers)
+        self.blank = numbers.index(0)
+        self.misplaced = sum(1 for cell, tile in enumerate(numbers)
+                             if tile and tile != cell+1)
+        self.masks = move_masks(size)
+        self.steps = {"left": 1, "right": -1, "up": size, "down": -size}
+
+    def moves(self) -> tuple:
+        '''
+        Return:
+            Returns the names of the proper moves
+        '''
+        return NAMES[self.masks[self.blank]]
+
+    def is_proper(self, name:str) -> bool:
+        '''
+        Parameters:
+            name (str): "left", "right", "up" or "down"
+
+        Return:
+            Returns True if the move can be made
+        '''
+        return bool(self.masks[self.blank] & BITS[MOVES.index(name)])
+
+    def move(self, name:str) -> int:
+        '''
+        Parameters:
+            name (str): "left", "right", "up" or "down"
+
+        Return:
+            Returns the tile that has been moved
+        '''
+        if not self.is_proper(name):
+            raise ValueError(f"The move {name} is not proper here!")
+        blank = self.blank
+        cell = blank + self.steps[name]
+        tile = self.tiles[cell]
+        # the tile leaves cell and arrives at blank
+        self.misplaced += (tile != blank+1) - (tile != cell+1)
+        self.tiles[blank] = tile
+        self.tiles[cell] = 0
+        self.blank = cell
+        return tile
+
+    def is_solved(self) -> bool:
+        '''
+        Return:
+            Returns True if the puzzle is ordered sequentially
+        '''
+        return self.misplaced == 0
+
+    def to_list(self) -> list:
+        '''
+        Return:
+            Returns the puzzle in list form, blank as " "
+        '''
+        numbers = self.tiles.tolist()
+        numbers[self.blank] = " "
+        return numbers
+
+    def state(self) -> PuzzleState:
+        '''
+        Return:
+            Returns a hashable snapshot of the puzzle
+        '''
+        return PuzzleState.from_list(self.tiles, self.size)
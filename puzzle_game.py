@@ -0,0 +1,268 @@
+'''
+Here is the game of A2 without any graphics.
+
+Data model:
+
+PuzzleGame -> the Board from puzzle_core.py, the hinted place and the
+              plan of hints of large puzzles
+    A click is given as the place of A2: the row counted from the bottom
+    and the column from the left, both from 0.
+Renderer -> anything with the five methods below, told about every change
+    start(game) -> draw the whole puzzle
+    swap(game, blank_place, tile_place) -> a tile moved into the blank
+    hint(game, place, shown) -> a hint is shown or taken back
+    solved(game) -> the puzzle has just been solved
+    frame() -> everything of a frame is told, draw it
+
+NullRenderer draws nothing, for benchmarks and tests, and TextRenderer
+draws in the terminal with puzzle_render.py. The turtle renderer lives
+in A2, so the game itself never needs Tk or a display.
+
+Run this file directly for a benchmark of the clicks per second.
+'''
+
+import random
+from puzzle_cache import SolutionCache
+from puzzle_core import Board
+from puzzle_large_solver import solve_large
+from puzzle_render import TerminalRenderer
+
+# larger puzzles are hinted by the constructive solver
+LARGE = 5
+
+class NullRenderer:
+    '''
+    Draws nothing.
+    '''
+
+    def start(self, game:"PuzzleGame") -> None:
+        pass
+
+    def swap(self, game:"PuzzleGame", blank_place:int, tile_place:int) -> None:
+        pass
+
+    def hint(self, game:"PuzzleGame", place:int, shown:bool) -> None:
+        pass
+
+    def solved(self, game:"PuzzleGame") -> None:
+        pass
+
+    def frame(self) -> None:
+        pass
+
+class TextRenderer(NullRenderer):
+    '''
+    Draws the puzzle in the terminal, from top to bottom as A2 shows it.
+    '''
+
+    def __init__(self, size:int, stream=None, ansi:bool=None, every:int=1):
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+            stream: The text stream written to, sys.stdout by default
+            ansi (bool): Rewrite only changed cells, by default in a terminal
+            every (int): Draw every Nth move, 0 for only the final puzzle
+        '''
+        self.terminal = TerminalRenderer(size, stream, ansi, every)
+
+    def start(self, game:"PuzzleGame") -> None:
+        self.terminal.draw(game.board.tiles)
+
+    def swap(self, game:"PuzzleGame", blank_place:int, tile_place:int) -> None:
+        display = game.display
+        self.terminal.moved(game.board.tiles,
+                            (display[blank_place], display[tile_place]))
+
+    def solved(self, game:"PuzzleGame") -> None:
+        self.terminal.finish(game.board.tiles)
+
+class PuzzleGame:
+    '''
+    The state and the rules of A2, driven by clicks on places.
+    '''
+
+    def __init__(self, position_list:list, size:int, renderer=None,
+                 cache=None):
+        '''
+        Parameters:
+            position_list (list): The puzzle in the order of A2
+            size (int): An integer suggested to be 3 to 30
+            renderer: The renderer told about every change, none by default
+            cache (SolutionCache): The solutions of the hints up to 5x5,
+                opened at the first hint if not given
+        '''
+        self.size = size
+        self.board = Board.from_display(position_list, size)
+        self.display = self.board.layout.display
+        self.renderer = renderer or NullRenderer()
+        self.cache = cache
+        self.hint_place = -1
+        # the constructive solution followed by the hints of large puzzles
+        self.plan = None
+        self.planned = None
+        self.moves = 0
+
+    @classmethod
+    def random(cls, size:int, renderer=None, cache=None,
+               rng:random.Random=None) -> "PuzzleGame":
+        '''
+        Parameters:
+            size (int): An integer suggested to be 3 to 30
+            renderer: The renderer told about every change, none by default
+            cache (SolutionCache): The solutions of the hints up to 5x5
+            rng (random.Random): The random generator, defaults to random
+
+        Return:
+            Returns a game of a random solvable puzzle
+        '''
+        board = Board.random(size, rng)
+        return cls(board.display_list(), size, renderer, cache)
+
+    def display_list(self) -> list:
+        '''
+        Return:
+            Returns the puzzle in the order of A2, blank as " "
+        '''
+        return self.board.display_list()
+
+    def number_at(self, place:int):
+        '''
+        Parameters:
+            place (int): A place of A2
+
+        Return:
+            Returns the number shown at the place, " " for the blank
+        '''
+        return self.board.tiles[self.display[place]] or " "
+
+    def is_solved(self) -> bool:
+        '''
+        Return:
+            Returns True if the puzzle is ordered sequentially
+        '''
+        return self.board.is_solved()
+
+    def click(self, row:int, col:int) -> str:
+        '''
+        Parameters:
+            row (int): The row of the click, counted from the bottom from 0
+            col (int): The column of the click, counted from 0
+
+        Return:
+            Returns the move made, "hint" if a hint is shown, or None
+        '''
+        size = self.size
+        if 0 <= row < size and 0 <= col < size:
+            return self.click_place(row*size + col)
+        return None
+
+    def click_place(self, place:int) -> str:
+        '''
+        Parameters:
+            place (int): The place of the click in the list of A2
+
+        Return:
+            Returns the move made, "hint" if a hint is shown, or None
+        '''
+        board = self.board
+        cell = self.display[place]
+
+        if self.hint_place >= 0:
+            self.renderer.hint(self, self.hint_place, False)
+            self.hint_place = -1
+
+        if cell == board.blank:
+            if board.is_solved():
+                return None
+            self.show_hint(self.hint())
+            return "hint"
+
+        move = board.layout.move_of[board.blank].get(cell)
+        if move is None:
+            return None
+        blank_place = self.display[board.blank]
+        board.move(move)
+        self.moves += 1
+        # a move away from the plan of the hints makes it useless
+        if move != self.planned:
+            self.plan = None
+        self.planned = None
+
+        self.renderer.swap(self, blank_place, place)
+        if board.is_solved():
+            self.renderer.solved(self)
+        return move
+
+    def show_hint(self, move:str) -> None:
+        '''
+        Parameters:
+            move (str): The move to hint, "left", "right", "up" or "down"
+        '''
+        if self.hint_place >= 0:
+            self.renderer.hint(self, self.hint_place, False)
+        self.hint_place = self.display[self.board.source(move)]
+        self.renderer.hint(self, self.hint_place, True)
+
+    def hint(self) -> str:
+        '''
+        Return:
+            Returns the next move towards the solution, optimal up to 5x5
+        '''
+        if self.size > LARGE:
+            # planning again after every move could lead round in circles,
+            # so one constructive solution is kept while it is followed
+            if self.plan is None:
+                self.plan = solve_large(self.board.to_list(), self.size)
+            if self.planned is None:
+                self.planned = next(self.plan)
+            return self.planned
+        if self.cache is None:
+            self.cache = SolutionCache()
+        return self.cache.next_move(self.board.to_list(), self.size)
+
+def _click_streams(game:PuzzleGame, count:int, rng:random.Random) -> tuple:
+    # random clicks, mostly on tiles that cannot move, and clicks that
+    # always move a tile, both never on the blank, which would ask a hint
+    streams = []
+    for moving in (False, True):
+        walk = Board(game.board.to_list(), game.size)
+        places = []
+        for _ in range(count):
+            if moving:
+                name = rng.choice(walk.moves())
+            else:
+                place = rng.randrange(game.size**2)
+                while game.display[place] == walk.blank:
+                    place = rng.randrange(game.size**2)
+                name = walk.move_name(game.display[place])
+            if name is not None:
+                place = game.display[walk.source(name)]
+                walk.move(name)
+            places.append(place)
+        streams.append(places)
+    return streams
+
+def benchmark(count:int=1_000_000, sizes:tuple=(4, 30), seed:int=0) -> None:
+    '''
+    Parameters:
+        count (int): The number of clicks of every run
+        sizes (tuple): The sizes of the puzzles
+        seed (int): The seed of the random puzzles and clicks
+    '''
+    from time import perf_counter
+
+    rng = random.Random(seed)
+    for size in sizes:
+        puzzle = PuzzleGame.random(size, rng=rng).display_list()
+        streams = _click_streams(PuzzleGame(puzzle, size), count, rng)
+        for name, places in zip(("random clicks", "moving clicks"), streams):
+            game = PuzzleGame(puzzle, size)
+            start = perf_counter()
+            for place in places:
+                game.click_place(place)
+            spent = perf_counter() - start
+            print(f"{size}x{size} {name}: {count / spent:,.0f} clicks/s, "
+                  f"{game.moves} moves")
+
+if __name__ == "__main__":
+    benchmark()
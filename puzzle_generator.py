@@ -0,0 +1,113 @@
+'''
+Here is the puzzle generator shared by A1 and A2.
+
+Instead of shuffling again and again until the puzzle is solvable,
+we shuffle only once and fix the parity by a single swap:
+Exchanging two number tiles changes the inverse sum by an odd number
+and leaves the blank where it is, so an unsolvable puzzle becomes
+solvable. As the swap is always done on the same two cells for a given
+blank, it pairs every unsolvable puzzle with exactly one solvable one,
+which keeps the generated puzzles uniformly random.
+
+generate_solvable() -> one solvable puzzle in A1 list form, blank as " "
+iter_solvable() -> a stream of solvable puzzles in A1 list form
+generate_batch() -> k solvable puzzles at once as a NumPy array,
+                    one puzzle per row and blank as 0
+
+NumPy is only needed by generate_batch(), which checks the parity of
+all puzzles at once with solvable() of puzzle_vectorized.py.
+'''
+
+import random
+from puzzle_solvability import is_solvable
+from puzzle_vectorized import blank_cells, solvable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _swap_cells(blank:int) -> tuple:
+    # the first two cells that are not the blank
+    if blank == 0:
+        return 1, 2
+    if blank == 1:
+        return 0, 2
+    return 0, 1
+
+def generate_solvable(size:int, rng:random.Random=None) -> list:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+        rng (random.Random): The random generator, defaults to random
+
+    Return:
+        Returns a solvable puzzle in list form
+    '''
+    board = list(range(1, size**2))
+    board.append(" ")
+    (rng or random).shuffle(board)
+    if not is_solvable(board, size):
+        i, j = _swap_cells(board.index(" "))
+        board[i], board[j] = board[j], board[i]
+    return board
+
+def iter_solvable(count:int, size:int, seed:int=None):
+    '''
+    Parameters:
+        count (int): The number of puzzles to generate
+        size (int): An integer suggested to be >= 3
+        seed (int): The seed for a reproducible stream
+
+    Return:
+        Yields solvable puzzles in list form one by one
+    '''
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_solvable(size, rng)
+
+def generate_batch(count:int, size:int, seed:int=None,
+                   chunk:int=1 << 16):
+    '''
+    Parameters:
+        count (int): The number of puzzles to generate
+        size (int): An integer suggested to be >= 3
+        seed (int): The seed for a reproducible batch
+        chunk (int): The number of rows handled by one vectorized pass
+
+    Return:
+        Returns a numpy array of shape (count, size*size), blank as 0
+    '''
+    if np is None:
+        raise ImportError("generate_batch() requires numpy")
+
+    n = size**2
+    rng = np.random.default_rng(seed)
+    dtype = np.uint8 if n <= 256 else np.uint32
+    boards = np.empty((count, n), dtype=dtype)
+
+    for start in range(0, count, chunk):
+        stop = min(start + chunk, count)
+        part = boards[start:stop]
+        part[:] = rng.permuted(np.tile(np.arange(n, dtype=dtype),
+                                       (stop-start, 1)), axis=1)
+
+        blank = blank_cells(part)
+        unsolvable = np.flatnonzero(~solvable(part, size))
+
+        # fix the parity by swapping the first two number tiles
+        first = np.where(blank[unsolvable] == 0, 1, 0)
+        second = np.where(blank[unsolvable] <= 1, 2, 1)
+        part[unsolvable, first], part[unsolvable, second] = \
+            part[unsolvable, second], part[unsolvable, first]
+
+    return boards
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    for size in (3, 4, 5):
+        start = perf_counter()
+        batch = generate_batch(1_000_000, size, seed=0)
+        print(f"{size}x{size}: {len(batch)} puzzles "
+              f"in {perf_counter() - start:.2f}s")
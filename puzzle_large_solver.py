@@ -0,0 +1,287 @@
+'''
+Here is the constructive solver for very large puzzles.
+
+An optimal search is hopeless beyond 5x5, but any solvable puzzle can
+be ordered the way people do it by hand, which proves it is solvable and
+gives a (not optimal) solution:
+
+a. rows: order the top row, then the next one, until two rows are left
+   The last two tiles of a row are brought into the 3x2 block around
+   their places and ordered there together.
+b. columns: order the last two rows column by column from the left
+   The two tiles of a column are ordered together in a 2x3 block.
+c. the last 2x2 block
+
+A tile is moved one cell at a time towards its place. For every step,
+the blank is first routed to the cell the tile goes to, around the tile
+and away from the cells already ordered. The route is nearly always a
+straight path with one or two turns, checked cell by cell, so a tile
+costs O(n) moves and the whole n x n puzzle O(n^3).
+Only when no such path is free, a breadth first search finds the route.
+
+The small blocks are solved by a breadth first search over the places
+of their few tracked tiles, which has at most a few hundred states.
+
+The board is kept in arrays, together with the cell of every tile.
+solve_large() is a generator, so moves are handed out as they are found
+and the solution is never held in memory.
+
+Run this file directly for a benchmark at sizes 10, 50, 100 and 200.
+'''
+
+from array import array
+from collections import deque
+from time import perf_counter
+from puzzle_solvability import is_solvable
+from puzzle_state import move_table
+
+class _Board:
+    # The board in play: tiles of every cell, cell of every tile,
+    # the blank and the cells that must not move any more.
+
+    def __init__(self, board:list, size:int):
+        numbers = [0 if t == " " else t for t in board]
+        self.size = size
+        self.tiles = array("I", numbers)
+        self.cell_of = array("I", bytes(4 * size**2))
+        for cell, tile in enumerate(numbers):
+            self.cell_of[tile] = cell
+        self.blank = self.cell_of[0]
+        self.locked = bytearray(size**2)
+        self.fallbacks = 0
+
+    def slide(self, cell:int) -> str:
+        # move the tile of cell, next to the blank, into the blank
+        blank, size = self.blank, self.size
+        step = cell - blank
+        tile = self.tiles[cell]
+        self.tiles[blank] = tile
+        self.cell_of[tile] = blank
+        self.tiles[cell] = 0
+        self.cell_of[0] = cell
+        self.blank = cell
+        if step == 1:
+            return "left"
+        if step == -1:
+            return "right"
+        return "up" if step == size else "down"
+
+    def _free(self, cell:int, avoid:int) -> bool:
+        return cell != avoid and not self.locked[cell]
+
+    def _line(self, start:tuple, end:tuple) -> list:
+        # the cells after start up to end on a straight line
+        size = self.size
+        (r0, c0), (r1, c1) = start, end
+        if r0 == r1:
+            step = 1 if c1 > c0 else -1
+            return [r0*size + c for c in range(c0+step, c1+step, step)]
+        step = 1 if r1 > r0 else -1
+        return [r*size + c0 for r in range(r0+step, r1+step, step)]
+
+    def _path(self, corners:list, avoid:int) -> list:
+        cells = []
+        for start, end in zip(corners, corners[1:]):
+            if start == end:
+                continue
+            for cell in self._line(start, end):
+                if not self._free(cell, avoid):
+                    return None
+                cells.append(cell)
+        return cells
+
+    def route(self, target:int, avoid:int=-1) -> list:
+        # the cells the blank passes through to reach target
+        size = self.size
+        start = divmod(self.blank, size)
+        end = divmod(target, size)
+        if start == end:
+            return []
+        (r0, c0), (r1, c1) = start, end
+        ar, ac = divmod(avoid, size) if avoid >= 0 else (r0, c0)
+
+        candidates = [[start, (r0, c1), end], [start, (r1, c0), end]]
+        for r in {r0-1, r0+1, r1-1, r1+1, ar-1, ar+1}:
+            if 0 <= r < size:
+                candidates.append([start, (r, c0), (r, c1), end])
+        for c in {c0-1, c0+1, c1-1, c1+1, ac-1, ac+1}:
+            if 0 <= c < size:
+                candidates.append([start, (r0, c), (r1, c), end])
+
+        best = None
+        for corners in candidates:
+            path = self._path(corners, avoid)
+            if path is not None and (best is None or len(path) < len(best)):
+                best = path
+        if best is None:
+            self.fallbacks += 1
+            best = self._search(target, avoid)
+        return best
+
+    def _search(self, target:int, avoid:int) -> list:
+        moves = move_table(self.size).values()
+        came_from = {self.blank: None}
+        queue = deque([self.blank])
+        while queue:
+            cell = queue.popleft()
+            if cell == target:
+                break
+            for near in (cells[cell] for cells in moves):
+                if (near >= 0 and near not in came_from
+                        and self._free(near, avoid)):
+                    came_from[near] = cell
+                    queue.append(near)
+        if target not in came_from:
+            raise RuntimeError("The blank cannot reach its target")
+        path = []
+        cell = target
+        while cell != self.blank:
+            path.append(cell)
+            cell = came_from[cell]
+        path.reverse()
+        return path
+
+    def move_blank(self, target:int, avoid:int=-1):
+        for cell in self.route(target, avoid):
+            yield self.slide(cell)
+
+    def move_tile(self, tile:int, target:int, until:set=None):
+        # move tile one cell at a time until it is at target (or in until)
+        size = self.size
+        until = until or {target}
+        gr, gc = divmod(target, size)
+        while self.cell_of[tile] not in until:
+            cell = self.cell_of[tile]
+            row, col = divmod(cell, size)
+            # horizontally first, unless that cell is taken already
+            if col != gc and not self.locked[cell + (1 if gc > col else -1)]:
+                step = cell + (1 if gc > col else -1)
+            else:
+                step = cell + (size if gr > row else -size)
+            yield from self.move_blank(step, avoid=cell)
+            yield self.slide(cell)
+
+    def solve_block(self, cells:list, goals:dict, blank:int=-1):
+        # order the tracked tiles of goals (tile: cell) inside the block,
+        # and the blank too if blank is given
+        moves = move_table(self.size).values()
+        inside = set(cells)
+        tracked = list(goals)
+        start = (self.blank, tuple(self.cell_of[t] for t in tracked))
+        goal = tuple(goals[t] for t in tracked)
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            empty, places = state
+            if places == goal and (blank < 0 or empty == blank):
+                break
+            for near in (table[empty] for table in moves):
+                if near not in inside:
+                    continue
+                following = (near, tuple(empty if p == near else p
+                                         for p in places))
+                if following not in came_from:
+                    came_from[following] = state
+                    queue.append(following)
+        else:
+            raise RuntimeError("The block cannot be ordered")
+        empties = []
+        while state != start:
+            empties.append(state[0])
+            state = came_from[state]
+        for cell in reversed(empties):
+            yield self.slide(cell)
+
+def solve_large(board:list, size:int):
+    '''
+    Parameters:
+        board (list): The puzzle in list form, blank as " " or 0
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Yields the moves of a solution one by one, in the words of
+        play_the_puzzle(): "left", "right", "up" or "down"
+    '''
+    if not is_solvable(board, size):
+        raise ValueError("The puzzle is not solvable!")
+    b = _Board(board, size)
+    yield from _solve(b, size)
+
+def _solve(b:_Board, size:int):
+    n = size
+
+    # a. rows, all but the last two
+    for r in range(n-2):
+        for c in range(n-2):
+            yield from b.move_tile(r*n + c+1, r*n + c)
+            b.locked[r*n + c] = 1
+        first, last = r*n + n-1, r*n + n
+        yield from b.move_tile(first, r*n + n-2)
+        b.locked[r*n + n-2] = 1
+        block = [(r+i)*n + c for i in range(3) for c in (n-2, n-1)]
+        yield from b.move_tile(last, (r+1)*n + n-1, until=set(block))
+        yield from _blank_into(b, block, (last,))
+        b.locked[r*n + n-2] = 0
+        yield from b.solve_block(block, {first: r*n + n-2, last: r*n + n-1})
+        b.locked[r*n + n-2] = b.locked[r*n + n-1] = 1
+
+    # b. the last two rows, all but the last two columns
+    for c in range(n-2):
+        upper, lower = (n-2)*n + c+1, (n-1)*n + c+1
+        yield from b.move_tile(upper, (n-2)*n + c)
+        b.locked[(n-2)*n + c] = 1
+        block = [r*n + c+i for r in (n-2, n-1) for i in range(3)]
+        yield from b.move_tile(lower, (n-1)*n + c+1, until=set(block))
+        yield from _blank_into(b, block, (lower,))
+        b.locked[(n-2)*n + c] = 0
+        yield from b.solve_block(block, {upper: (n-2)*n + c,
+                                         lower: (n-1)*n + c})
+        b.locked[(n-2)*n + c] = b.locked[(n-1)*n + c] = 1
+
+    # c. the last 2x2 block
+    block = [r*n + c for r in (n-2, n-1) for c in (n-2, n-1)]
+    yield from b.solve_block(block, {cell+1: cell for cell in block[:3]},
+                             blank=block[3])
+
+def _blank_into(b:_Board, block:list, tiles:tuple):
+    # bring the blank into the block without moving the given tiles
+    if b.blank in block:
+        return
+    taken = {b.cell_of[t] for t in tiles}
+    free = [cell for cell in block if cell not in taken
+            and not b.locked[cell]]
+    target = min(free, key=lambda cell: abs(cell // b.size -
+                                            b.blank // b.size)
+                 + abs(cell % b.size - b.blank % b.size))
+    for t in tiles:
+        b.locked[b.cell_of[t]] = 1
+    yield from b.move_blank(target)
+    for t in tiles:
+        b.locked[b.cell_of[t]] = 0
+
+def benchmark(sizes:tuple=(10, 50, 100, 200), seed:int=1) -> None:
+    '''
+    Parameters:
+        sizes (tuple): The sizes of the puzzles
+        seed (int): The seed of the random puzzles
+    '''
+    import random
+    from puzzle_generator import generate_solvable
+
+    rng = random.Random(seed)
+    for size in sizes:
+        b = _Board(generate_solvable(size, rng), size)
+        start = perf_counter()
+        count = 0
+        for move in _solve(b, size):
+            count += 1
+        spent = perf_counter() - start
+        assert b.tiles.tolist() == list(range(1, size**2)) + [0]
+        print(f"{size}x{size}: {count} moves in {spent:.2f}s, "
+              f"{count / max(spent, 1e-9):,.0f} moves/s, "
+              f"{count / size**3:.1f} moves per n^3, "
+              f"{b.fallbacks} searched routes")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,125 @@
+'''
+Here is the terminal renderer of the text puzzle.
+
+A frame looks the same as it always did: an empty line, the rows of
+tiles right aligned, and another empty line. It is built in one string
+and written with a single write, instead of a print() for every tile.
+
+The renderer has two modes:
+a. full: every frame is written as a whole, for pipes and files
+b. ansi: the first frame clears the screen and is drawn at its top,
+   after that a move only rewrites the two cells that changed,
+   with ANSI escape codes moving the cursor there,
+   and the lines below the board are cleared for the next prompt
+A terminal gets the ansi mode, anything else the full mode.
+
+Not every frame needs to be shown: with every=N only every Nth move is
+drawn, and with every=0 only the final puzzle, drawn by finish().
+'''
+
+import sys
+
+ESC = "\x1b["
+
+def tile_width(size:int) -> int:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns the width of every cell in characters
+    '''
+    return len(str(size**2-1)) + 1
+
+def render_frame(board, size:int) -> str:
+    '''
+    Parameters:
+        board: The puzzle in list form, blank as " " or 0
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns the whole frame in one string
+    '''
+    width = tile_width(size)
+    cells = [str(tile or " ").rjust(width) for tile in board]
+    rows = ["".join(cells[i:i+size]) for i in range(0, size**2, size)]
+    return "\n" + "\n".join(rows) + "\n\n"
+
+class TerminalRenderer:
+    '''
+    Draws the frames of one puzzle, each with a single write.
+    '''
+
+    def __init__(self, size:int, stream=None, ansi:bool=None, every:int=1):
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+            stream: The text stream written to, sys.stdout by default
+            ansi (bool): Rewrite only changed cells, by default if the
+                stream is a terminal
+            every (int): Draw every Nth move, 0 for only the final puzzle
+        '''
+        self.size = size
+        self.stream = stream or sys.stdout
+        if ansi is None:
+            isatty = getattr(self.stream, "isatty", None)
+            ansi = bool(isatty and isatty())
+        self.ansi = ansi
+        self.every = every
+        self.width = tile_width(size)
+        self.frames = 0
+        # in ansi mode, True once the board is drawn at the top
+        self.anchored = False
+        self.shown = False
+        # the cells changed since the last frame drawn
+        self.dirty = set()
+
+    def _write(self, text:str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+    def draw(self, board) -> None:
+        '''
+        Parameters:
+            board: The puzzle in list form, blank as " " or 0
+        '''
+        frame = render_frame(board, self.size)
+        if self.ansi:
+            frame = ESC + "H" + ESC + "2J" + frame
+            self.anchored = True
+        self._write(frame)
+        self.shown = True
+        self.dirty.clear()
+
+    def moved(self, board, cells:tuple) -> None:
+        '''
+        Parameters:
+            board: The puzzle after a move, blank as " " or 0
+            cells (tuple): The cells changed by the move
+        '''
+        self.frames += 1
+        self.shown = False
+        if self.ansi and self.anchored:
+            self.dirty.update(cells)
+        if not self.every or self.frames % self.every:
+            return
+        # beyond a quarter of the board a whole frame is shorter
+        if not self.anchored or len(self.dirty) * 4 > self.size**2:
+            self.draw(board)
+            return
+        # rewrite the changed cells, then clear what is below the board
+        size, width = self.size, self.width
+        parts = [f"{ESC}{cell // size + 2};{cell % size * width + 1}H"
+                 + str(board[cell] or " ").rjust(width) for cell in self.dirty]
+        parts.append(f"{ESC}{size + 3};1H{ESC}J")
+        self._write("".join(parts))
+        self.shown = True
+        self.dirty.clear()
+
+    def finish(self, board) -> None:
+        '''
+        Parameters:
+            board: The final puzzle, blank as " " or 0
+        '''
+        if not self.shown:
+            self.draw(board)
@@ -0,0 +1,140 @@
+'''
+Here is the solvability engine shared by A1 and A2.
+
+The puzzle is given in the A1 form: a list read from left to right,
+top to bottom, where the blank space is " " (or 0).
+
+The conclusion used to check solvability is the same as before:
+The puzzle is solvable if and only if,
+the size is odd and the inverse sum of the number tiles is even,
+or the size is even and the inverse sum plus the row of the blank is odd,
+provided that rows are counted from 0 at the top.
+
+Only the parity of the inverse sum matters, so we never need the nested
+loop that compares every pair of tiles. Two faster ways are given here:
+
+count_inversions() -> exact inverse sum with a Fenwick tree, O(n log n)
+permutation_parity() -> parity by counting cycles of the permutation, O(n)
+
+is_solvable() uses the O(n) parity, which makes a 1000x1000 board cheap.
+
+Run this file directly to compare both with the old nested loop.
+'''
+
+from random import shuffle
+from time import perf_counter
+
+def count_inversions(tiles:list) -> int:
+    '''
+    Parameters:
+        tiles (list): Distinct integers in 1..len(tiles), blank excluded
+
+    Return:
+        Returns the number of pairs i < j with tiles[i] > tiles[j]
+    '''
+    n = len(tiles)
+    tree = [0] * (n+1)
+    inverse_sum = 0
+    for seen, tile in enumerate(tiles):
+        # count how many of the seen tiles are <= tile
+        smaller = 0
+        i = tile
+        while i > 0:
+            smaller += tree[i]
+            i -= i & -i
+        inverse_sum += seen - smaller
+        i = tile
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+    return inverse_sum
+
+def permutation_parity(tiles:list) -> int:
+    '''
+    Parameters:
+        tiles (list): Distinct integers in 1..len(tiles), blank excluded
+
+    Return:
+        Returns 0 if the inverse sum is even and 1 if it is odd
+    '''
+    n = len(tiles)
+    visited = bytearray(n+1)
+    cycles = 0
+    for start in range(n):
+        if visited[start+1]:
+            continue
+        cycles += 1
+        i = start
+        while not visited[i+1]:
+            visited[i+1] = 1
+            i = tiles[i] - 1
+    return (n - cycles) % 2
+
+def is_solvable(board:list, size:int) -> bool:
+    '''
+    Parameters:
+        board (list): The puzzle in list form, blank as " " or 0
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns True if the puzzle can be ordered sequentially
+    '''
+    tiles = []
+    blank = 0
+    for index, tile in enumerate(board):
+        if tile == " " or tile == 0:
+            blank = index
+        else:
+            tiles.append(tile)
+    parity = permutation_parity(tiles)
+    if size % 2 == 0:
+        parity += blank // size
+    return parity % 2 == (size+1) % 2
+
+def _nested_loop_is_solvable(board:list, size:int) -> bool:
+    # The original O(n^2) check of A1, kept only for the benchmark
+    cordinate_sum = board.index(" ") % size + board.index(" ") // size + 2
+    check_list = [0 if i == " " else i for i in board]
+    inverse_sum = 0
+    for i in range(size**2):
+        for j in range(i):
+            if check_list[j] > check_list[i]:
+                inverse_sum += 1
+    inverse_sum += cordinate_sum
+    return (size % 2) != (inverse_sum % 2)
+
+def benchmark(sizes:tuple=(3, 4, 5, 10, 30, 100, 300, 1000),
+              loop_limit:int=100) -> None:
+    '''
+    Parameters:
+        sizes (tuple): The board sizes to be timed
+        loop_limit (int): The largest size still timed with the nested loop
+    '''
+    print(f"{'size':>6}{'nested loop':>14}{'fenwick':>12}{'parity':>12}")
+    for size in sizes:
+        board = list(range(1, size**2))
+        board.append(" ")
+        shuffle(board)
+        tiles = [i for i in board if i != " "]
+
+        start = perf_counter()
+        result = is_solvable(board, size)
+        parity_time = perf_counter() - start
+
+        start = perf_counter()
+        count_inversions(tiles)
+        fenwick_time = perf_counter() - start
+
+        if size <= loop_limit:
+            start = perf_counter()
+            if _nested_loop_is_solvable(board, size) != result:
+                raise AssertionError(f"Results differ at size {size}")
+            loop_time = f"{perf_counter() - start:.6f}"
+        else:
+            loop_time = "skipped"
+
+        print(f"{size:>6}{loop_time:>14}{fenwick_time:>12.6f}"
+              f"{parity_time:>12.6f}")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,293 @@
+'''
+Here is the optimal solver for the A1 puzzle.
+
+The puzzle is given in the A1 list form, read from left to right,
+top to bottom, with the blank space as " " (or 0).
+The solution uses the same vocabulary as play_the_puzzle():
+"left" slides the tile on the right of the blank into the blank,
+"right" the tile on its left, "up" the tile below and "down" the tile above.
+
+The search is IDA*, a depth first search that is repeated with a growing
+bound on (moves made + estimated moves left). The estimate is:
+
+Manhattan distance -> how far every tile is from its final place
+Linear conflict -> two tiles in their final row (or column) but in
+                   the wrong order need at least two extra moves
+
+Both are updated incrementally: a move changes the Manhattan distance of
+one tile, and only the two rows (or columns) it touches can change their
+conflicts. Moves that undo the previous one are never tried.
+
+The heuristic is a small object with reset() and move(), so other
+estimates can be plugged into search() without changing it.
+When the pattern databases of pattern_database.py have been built for
+the size, they are used instead, as they are much better informed.
+
+Run this file directly for a benchmark in nodes per second.
+'''
+
+from time import perf_counter
+from puzzle_solvability import is_solvable
+from puzzle_state import move_table
+
+# the opposite move of MOVES[i] is MOVES[i ^ 1]
+MOVES = ("left", "right", "up", "down")
+FOUND = -1
+# the nodes between two reports within a bound
+REPORT_NODES = 1 << 18
+
+def tiles_of(board:list) -> list:
+    '''
+    Parameters:
+        board (list): The puzzle in list form, blank as " " or 0
+
+    Return:
+        Returns the puzzle in list form with the blank as 0
+    '''
+    return [0 if tile == " " else tile for tile in board]
+
+def neighbor_table(size:int) -> list:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns for every blank cell the list of (move, cell) pairs,
+        where cell holds the tile that slides into the blank
+    '''
+    cells = [move_table(size)[name] for name in MOVES]
+    return [[(move, cells[move][blank]) for move in range(len(MOVES))
+             if cells[move][blank] >= 0] for blank in range(size**2)]
+
+def _longest_increasing(line:list) -> int:
+    best = []
+    for i, value in enumerate(line):
+        best.append(1 + max([best[j] for j in range(i) if line[j] < value],
+                            default=0))
+    return max(best, default=0)
+
+class ManhattanConflict:
+    '''
+    Manhattan distance plus linear conflicts, updated move by move.
+    '''
+
+    def __init__(self, size:int):
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+        '''
+        self.size = size
+        cells = range(size**2)
+        self.goal_row = [size-1] + [(t-1) // size for t in range(1, size**2)]
+        self.goal_col = [size-1] + [(t-1) % size for t in range(1, size**2)]
+        self.distance = [[0] * size**2]
+        for t in range(1, size**2):
+            self.distance.append([abs(c // size - self.goal_row[t])
+                                  + abs(c % size - self.goal_col[t])
+                                  for c in cells])
+        self.row_cache = [{} for _ in range(size)]
+        self.col_cache = [{} for _ in range(size)]
+
+    def _conflict(self, line:tuple, goal_line:list, goal_pos:list,
+                  i:int) -> int:
+        line = [goal_pos[t] for t in line if t and goal_line[t] == i]
+        return 2 * (len(line) - _longest_increasing(line))
+
+    def _row(self, r:int) -> int:
+        size = self.size
+        line = tuple(self.tiles[r*size:r*size+size])
+        value = self.row_cache[r].get(line)
+        if value is None:
+            value = self._conflict(line, self.goal_row, self.goal_col, r)
+            self.row_cache[r][line] = value
+        return value
+
+    def _col(self, c:int) -> int:
+        line = tuple(self.tiles[c::self.size])
+        value = self.col_cache[c].get(line)
+        if value is None:
+            value = self._conflict(line, self.goal_col, self.goal_row, c)
+            self.col_cache[c][line] = value
+        return value
+
+    def reset(self, tiles:list) -> int:
+        '''
+        Parameters:
+            tiles (list): The puzzle with blank as 0, shared with the search
+
+        Return:
+            Returns the estimate for the whole puzzle
+        '''
+        self.tiles = tiles
+        self.manhattan = sum(self.distance[t][c] for c, t in enumerate(tiles))
+        self.rows = [self._row(r) for r in range(self.size)]
+        self.cols = [self._col(c) for c in range(self.size)]
+        self.conflicts = sum(self.rows) + sum(self.cols)
+        return self.manhattan + self.conflicts
+
+    def move(self, tile:int, source:int, target:int) -> int:
+        '''
+        Parameters:
+            tile (int): The tile that has just been moved
+            source, target (int): The cells it moved from and to
+
+        Return:
+            Returns the estimate after the move
+        '''
+        size = self.size
+        self.manhattan += self.distance[tile][target] \
+            - self.distance[tile][source]
+        if source // size == target // size:
+            lines, update = self.cols, self._col
+            changed = (source % size, target % size)
+        else:
+            lines, update = self.rows, self._row
+            changed = (source // size, target // size)
+        for i in changed:
+            value = update(i)
+            self.conflicts += value - lines[i]
+            lines[i] = value
+        return self.manhattan + self.conflicts
+
+def default_heuristic(size:int):
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns the pattern databases if they are built for the size,
+        otherwise the Manhattan distance plus linear conflicts
+    '''
+    import pattern_database
+
+    if pattern_database.available(size):
+        return pattern_database.PatternHeuristic(size)
+    return ManhattanConflict(size)
+
+def search(board:list, size:int, heuristic=None, report=None) -> tuple:
+    '''
+    Parameters:
+        board (list): The puzzle in list form, blank as " " or 0
+        size (int): An integer suggested to be >= 3
+        heuristic: An object with reset() and move(), defaults to
+                   default_heuristic(size)
+        report: A function called with the bound and the nodes so far
+                whenever a bound is searched through, and every
+                REPORT_NODES nodes within a long bound
+
+    Return:
+        Returns the optimal moves in list form and the number of
+        expanded nodes
+    '''
+    tiles = tiles_of(board)
+    if not is_solvable(tiles, size):
+        raise ValueError("The puzzle is not solvable!")
+    heuristic = heuristic or default_heuristic(size)
+    table = neighbor_table(size)
+    move_tile = heuristic.move
+    path = []
+    nodes = 0
+    # one comparison per node, never true without report
+    checkpoint = REPORT_NODES if report is not None else float("inf")
+
+    def dfs(blank:int, g:int, h:int, bound:int, previous:int) -> int:
+        nonlocal nodes, checkpoint
+        nodes += 1
+        if nodes >= checkpoint:
+            checkpoint += REPORT_NODES
+            report(bound, nodes)
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return FOUND
+        minimum = 1 << 30
+        for direction, cell in table[blank]:
+            if direction ^ 1 == previous:
+                continue
+            tile = tiles[cell]
+            tiles[blank], tiles[cell] = tile, 0
+            result = dfs(cell, g+1, move_tile(tile, cell, blank),
+                         bound, direction)
+            tiles[blank], tiles[cell] = 0, tile
+            move_tile(tile, blank, cell)
+            if result == FOUND:
+                path.append(MOVES[direction])
+                return FOUND
+            if result < minimum:
+                minimum = result
+        return minimum
+
+    blank = tiles.index(0)
+    h = heuristic.reset(tiles)
+    bound = h
+    while True:
+        result = dfs(blank, 0, h, bound, -1)
+        if result == FOUND:
+            break
+        bound = result
+        if report is not None:
+            report(bound, nodes)
+    path.reverse()
+    return path, nodes
+
+def solve(board:list, size:int, heuristic=None) -> list:
+    '''
+    Parameters:
+        board (list): The puzzle in list form, blank as " " or 0
+        size (int): An integer suggested to be >= 3
+        heuristic: An object with reset() and move(), defaults to
+                   default_heuristic(size)
+
+    Return:
+        Returns the optimal moves in list form
+    '''
+    return search(board, size, heuristic)[0]
+
+def _scramble(size:int, steps:int, rng) -> list:
+    # walk the blank randomly away from the final state
+    tiles = list(range(1, size**2)) + [0]
+    table = neighbor_table(size)
+    blank, previous = size**2 - 1, -1
+    for _ in range(steps):
+        direction, cell = rng.choice([m for m in table[blank]
+                                      if m[0] ^ 1 != previous])
+        tiles[blank], tiles[cell] = tiles[cell], 0
+        blank, previous = cell, direction
+    return tiles
+
+def benchmark(cases:tuple=((3, None, 100), (4, 40, 20), (4, 60, 5)),
+              seed:int=0) -> None:
+    '''
+    Parameters:
+        cases (tuple): Triples of board size, scramble length and number
+                       of puzzles, where None means uniformly random
+        seed (int): The seed for reproducible puzzles
+    '''
+    import random
+    from puzzle_generator import generate_solvable
+
+    rng = random.Random(seed)
+    for size, steps, count in cases:
+        total_nodes = total_time = longest = length = 0
+        for _ in range(count):
+            if steps is None:
+                board = generate_solvable(size, rng)
+            else:
+                board = _scramble(size, steps, rng)
+            start = perf_counter()
+            moves, nodes = search(board, size)
+            spent = perf_counter() - start
+            total_nodes += nodes
+            total_time += spent
+            longest = max(longest, spent)
+            length += len(moves)
+        kind = "random" if steps is None else f"{steps}-move scrambled"
+        name = type(default_heuristic(size)).__name__
+        print(f"{size}x{size} {kind} ({name}): {count} puzzles, "
+              f"{length / count:.1f} moves, "
+              f"{total_time / count:.3f}s on average, {longest:.3f}s at most, "
+              f"{total_nodes / total_time:,.0f} nodes/s")
+
+if __name__ == "__main__":
+    benchmark()
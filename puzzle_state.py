@@ -0,0 +1,196 @@
+'''
+Here is the compact puzzle state shared by the sliding puzzle programs.
+
+Data model:
+
+PuzzleState -> size, tiles and the cell of the blank
+    a. up to 4x4: tiles packed into one integer, 4 bits per cell,
+       cell i in bits 4*i to 4*i+3
+    b. larger boards: tiles in bytes, one array item per cell
+The blank is always 0, and its cell is kept so it is never searched for.
+
+A state never changes. move() returns a new state, which keeps it
+hashable, so it can be a key of a dictionary or a set.
+On a packed board a move is a few integer operations:
+the blank nibble is 0, so the moved tile is subtracted from its cell
+and added to the blank cell.
+
+The table a move needs, the cell next to every blank cell in every
+direction, is computed once per size.
+
+Moves use the words of play_the_puzzle():
+"left" slides the tile on the right of the blank into the blank,
+"right" the tile on its left, "up" the tile below and "down" the tile above.
+'''
+
+from array import array
+from functools import lru_cache
+
+MOVES = ("left", "right", "up", "down")
+PACKED_SIZE = 4
+
+@lru_cache(maxsize=None)
+def move_table(size:int) -> dict:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns for every move name a tuple with, for every blank cell,
+        the cell of the tile that slides in, or -1 if it is not proper
+    '''
+    cells = range(size**2)
+    return {
+        "left": tuple(c+1 if c % size != size-1 else -1 for c in cells),
+        "right": tuple(c-1 if c % size != 0 else -1 for c in cells),
+        "up": tuple(c+size if c // size != size-1 else -1 for c in cells),
+        "down": tuple(c-size if c // size != 0 else -1 for c in cells),
+    }
+
+@lru_cache(maxsize=None)
+def proper_moves(size:int) -> tuple:
+    '''
+    Parameters:
+        size (int): An integer suggested to be >= 3
+
+    Return:
+        Returns for every blank cell the tuple of proper move names
+    '''
+    table = move_table(size)
+    return tuple(tuple(m for m in MOVES if table[m][c] >= 0)
+                 for c in range(size**2))
+
+def _typecode(size:int) -> str:
+    if size**2 <= 1 << 8:
+        return "B"
+    if size**2 <= 1 << 16:
+        return "H"
+    return "I"
+
+class PuzzleState:
+    '''
+    An immutable puzzle, packed into an integer up to 4x4.
+    '''
+
+    __slots__ = ("size", "tiles", "blank")
+
+    def __init__(self, size:int, tiles, blank:int):
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+            tiles (int or bytes): The packed tiles, blank as 0
+            blank (int): The cell of the blank
+        '''
+        self.size = size
+        self.tiles = tiles
+        self.blank = blank
+
+    @classmethod
+    def from_list(cls, board:list, size:int) -> "PuzzleState":
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be >= 3
+
+        Return:
+            Returns the puzzle as a state
+        '''
+        numbers = [0 if t == " " else t for t in board]
+        blank = numbers.index(0)
+        if size <= PACKED_SIZE:
+            tiles = 0
+            for cell, tile in enumerate(numbers):
+                tiles |= tile << (4*cell)
+        else:
+            tiles = array(_typecode(size), numbers).tobytes()
+        return cls(size, tiles, blank)
+
+    @classmethod
+    def goal(cls, size:int) -> "PuzzleState":
+        '''
+        Parameters:
+            size (int): An integer suggested to be >= 3
+
+        Return:
+            Returns the puzzle ordered sequentially
+        '''
+        return _goal(size)
+
+    def __getitem__(self, cell:int) -> int:
+        if isinstance(self.tiles, int):
+            return (self.tiles >> (4*cell)) & 15
+        return self._items()[cell]
+
+    def _items(self) -> array:
+        items = array(_typecode(self.size))
+        items.frombytes(self.tiles)
+        return items
+
+    def to_list(self) -> list:
+        '''
+        Return:
+            Returns the puzzle in list form, blank as " "
+        '''
+        if isinstance(self.tiles, int):
+            numbers = [(self.tiles >> (4*c)) & 15 for c in range(self.size**2)]
+        else:
+            numbers = self._items().tolist()
+        numbers[self.blank] = " "
+        return numbers
+
+    def key(self) -> bytes:
+        '''
+        Return:
+            Returns the packed tiles in bytes, equal for equal puzzles
+        '''
+        if isinstance(self.tiles, int):
+            return self.tiles.to_bytes(8, "little")
+        return self.tiles
+
+    def moves(self) -> tuple:
+        '''
+        Return:
+            Returns the names of the proper moves
+        '''
+        return proper_moves(self.size)[self.blank]
+
+    def move(self, name:str) -> "PuzzleState":
+        '''
+        Parameters:
+            name (str): "left", "right", "up" or "down"
+
+        Return:
+            Returns the puzzle after the move
+        '''
+        cell = move_table(self.size)[name][self.blank]
+        if cell < 0:
+            raise ValueError(f"The move {name} is not proper here!")
+        if isinstance(self.tiles, int):
+            tile = (self.tiles >> (4*cell)) & 15
+            tiles = self.tiles - (tile << (4*cell)) + (tile << (4*self.blank))
+        else:
+            items = self._items()
+            items[self.blank], items[cell] = items[cell], 0
+            tiles = items.tobytes()
+        return PuzzleState(self.size, tiles, cell)
+
+    def is_solved(self) -> bool:
+        '''
+        Return:
+            Returns True if the puzzle is ordered sequentially
+        '''
+        return self == _goal(self.size)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PuzzleState) and self.size == other.size \
+            and self.blank == other.blank and self.tiles == other.tiles
+
+    def __hash__(self) -> int:
+        return hash((self.size, self.tiles))
+
+    def __repr__(self) -> str:
+        return f"PuzzleState({self.size}, {self.to_list()})"
+
+@lru_cache(maxsize=None)
+def _goal(size:int) -> PuzzleState:
+    return PuzzleState.from_list(list(range(1, size**2)) + [0], size)
@@ -0,0 +1,164 @@
+'''
+Here is the complete distance table of the 3x3 puzzle.
+
+The 3x3 puzzle has only 9!/2 = 181,440 solvable states, so the distance
+of every state from the final one fits into a 181,440 byte table,
+built once by a breadth first search and cached on disk.
+
+Every solvable state is numbered by a perfect hash:
+index = blank cell * 20160 + Lehmer rank of the 8 number tiles // 2
+For a 3x3 puzzle the number tiles are always in an even order, so the
+last but one Lehmer digit is known from the others and can be dropped,
+which is what the // 2 does.
+
+After that, "distance to solved" is one lookup, and "best next move"
+is at most four lookups, one for every proper move.
+
+distance() -> the number of moves left in an optimal solution
+best_move() -> a move of an optimal solution, in play_the_puzzle() words
+'''
+
+import os
+from math import factorial
+from puzzle_solver import MOVES, neighbor_table
+
+DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+PATH = os.path.join(DIRECTORY, "distance_3x3.bin")
+
+SIZE = 3
+STATES = factorial(SIZE**2) // 2
+HALF = factorial(SIZE**2 - 1) // 2
+
+_table = None
+
+def tile_rank(tiles:tuple) -> int:
+    '''
+    Parameters:
+        tiles (tuple): The 8 number tiles in order, blank left out
+
+    Return:
+        Returns the Lehmer rank of the tiles divided by 2
+    '''
+    number = 0
+    used = 0
+    for i, tile in enumerate(tiles[:-2]):
+        smaller = tile - 1 - (used & ((1 << tile) - 1)).bit_count()
+        number = number * (8-i) + smaller
+        used |= 1 << tile
+    return number
+
+def board_index(board:list) -> int:
+    '''
+    Parameters:
+        board (list): A solvable 3x3 puzzle in list form, blank as " " or 0
+
+    Return:
+        Returns the place of the puzzle in the distance table
+    '''
+    tiles = tuple(t for t in board if t != " " and t != 0)
+    for blank, tile in enumerate(board):
+        if tile == " " or tile == 0:
+            return blank * HALF + tile_rank(tiles)
+
+def build() -> bytearray:
+    '''
+    Return:
+        Returns the distance of every state, indexed by board_index()
+    '''
+    table = bytearray(b"\xff") * STATES
+    tiles = tuple(range(1, SIZE**2))
+    blank = SIZE**2 - 1
+    start = blank * HALF + tile_rank(tiles)
+    table[start] = 0
+    layer = [(tiles, blank, tile_rank(tiles))]
+    depth = 0
+    # every order of the tiles shows up with all 9 blank cells
+    ranks = {}
+
+    while layer:
+        depth += 1
+        following = []
+        for tiles, blank, number in layer:
+            row, col = divmod(blank, SIZE)
+            # sliding a tile sideways keeps the order of the tiles
+            for cell in (blank-1 if col else -1,
+                         blank+1 if col != SIZE-1 else -1):
+                if cell >= 0 and table[cell*HALF + number] == 255:
+                    table[cell*HALF + number] = depth
+                    following.append((tiles, cell, number))
+            # sliding a tile up or down makes it jump over two tiles
+            if row != SIZE-1:
+                cell = blank + SIZE
+                moved = tiles[:blank] + (tiles[blank+2],) \
+                    + tiles[blank:blank+2] + tiles[blank+3:]
+                _visit(table, following, ranks, moved, cell, depth)
+            if row:
+                cell = blank - SIZE
+                moved = tiles[:cell] + tiles[cell+1:blank] \
+                    + (tiles[cell],) + tiles[blank:]
+                _visit(table, following, ranks, moved, cell, depth)
+        layer = following
+
+    return table
+
+def _visit(table:bytearray, following:list, ranks:dict, tiles:tuple,
+           blank:int, depth:int) -> None:
+    number = ranks.get(tiles)
+    if number is None:
+        number = ranks[tiles] = tile_rank(tiles)
+    if table[blank*HALF + number] == 255:
+        table[blank*HALF + number] = depth
+        following.append((tiles, blank, number))
+
+def load(path:str=PATH) -> bytes:
+    '''
+    Parameters:
+        path (str): Where the table is cached
+
+    Return:
+        Returns the table, built and cached first if needed
+    '''
+    global _table
+
+    if _table is None:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                _table = f.read()
+        else:
+            _table = bytes(build())
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".part", "wb") as f:
+                f.write(_table)
+            os.replace(path + ".part", path)
+    return _table
+
+def distance(board:list) -> int:
+    '''
+    Parameters:
+        board (list): A solvable 3x3 puzzle in list form, blank as " " or 0
+
+    Return:
+        Returns the number of moves of an optimal solution
+    '''
+    return load()[board_index(board)]
+
+def best_move(board:list) -> str:
+    '''
+    Parameters:
+        board (list): A solvable 3x3 puzzle in list form, blank as " " or 0
+
+    Return:
+        Returns "left", "right", "up" or "down", or None if solved
+    '''
+    table = load()
+    board = [0 if t == " " else t for t in board]
+    blank = board.index(0)
+    left = table[board_index(board)]
+    if left == 0:
+        return None
+    for direction, cell in neighbor_table(SIZE)[blank]:
+        board[blank], board[cell] = board[cell], 0
+        after = table[board_index(board)]
+        board[cell], board[blank] = board[blank], 0
+        if after == left - 1:
+            return MOVES[direction]
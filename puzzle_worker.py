@@ -0,0 +1,118 @@
+'''
+Here is the solver working in a process of its own.
+
+A hard 5x5 puzzle can take minutes to solve optimally, and the GUI must
+keep answering clicks meanwhile, a click on cancel above all. So the
+search runs in another process rather than a thread: a thread would share
+the interpreter lock with Tk, and it could not be stopped halfway.
+
+Data model:
+
+SolverJob -> the process, the queue of its messages and what they told
+    ("progress", bound, nodes) -> after every bound searched through,
+                                  and every REPORT_NODES nodes of
+                                  puzzle_solver.py within one
+    ("done", moves) -> the solution, the moves in list form
+    ("error", message) -> the puzzle is not solvable
+
+a. poll() reads the messages without ever waiting, once per frame,
+   and notices a process that ended without a result, killed or
+   out of memory, so the job never waits for it forever
+b. cancel() ends the process at once, wherever the search is
+
+Puzzles beyond 5x5 are solved by solve_large() of puzzle_large_solver.py,
+the others optimally by search() of puzzle_solver.py.
+'''
+
+import multiprocessing
+import queue
+from time import perf_counter
+from puzzle_game import LARGE
+from puzzle_large_solver import solve_large
+from puzzle_solver import search
+
+def _work(board:list, size:int, messages:multiprocessing.Queue) -> None:
+    # runs in the other process
+    def report(bound:int, nodes:int) -> None:
+        messages.put(("progress", bound, nodes))
+
+    try:
+        if size > LARGE:
+            moves = list(solve_large(board, size))
+        else:
+            moves, _ = search(board, size, report=report)
+    except ValueError as err_msg:
+        messages.put(("error", str(err_msg)))
+        return
+    messages.put(("done", moves))
+
+class SolverJob:
+    '''
+    A solution being searched in another process.
+    '''
+
+    def __init__(self, board:list, size:int):
+        '''
+        Parameters:
+            board (list): The puzzle in list form, blank as " " or 0
+            size (int): An integer suggested to be >= 3
+        '''
+        self.board = list(board)
+        self.size = size
+        self.bound = 0
+        self.nodes = 0
+        self.moves = None
+        self.error = None
+        self.started = perf_counter()
+        self.messages = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_work, args=(self.board, size, self.messages), daemon=True)
+        self.process.start()
+
+    def poll(self) -> bool:
+        '''
+        Return:
+            Returns True if the job is done, with moves or an error
+        '''
+        # a process that has ended has sent all its messages before
+        ended = not self.process.is_alive()
+        while not self.done():
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                _, self.bound, self.nodes = message
+            elif message[0] == "done":
+                self.moves = message[1]
+            else:
+                self.error = message[1]
+        if ended and not self.done():
+            self.error = f"The solver stopped ({self.process.exitcode})"
+        if self.done():
+            self.process.join()
+        return self.done()
+
+    def done(self) -> bool:
+        '''
+        Return:
+            Returns True if the job is done, with moves or an error
+        '''
+        return self.moves is not None or self.error is not None
+
+    def elapsed(self) -> float:
+        '''
+        Return:
+            Returns the seconds since the job started
+        '''
+        return perf_counter() - self.started
+
+    def cancel(self) -> None:
+        '''
+        Ends the search at once.
+        '''
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        if not self.done():
+            self.error = "Cancelled"
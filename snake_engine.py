@@ -0,0 +1,682 @@
+"""
+Here is the data model:
+
+SnakeEngine -> the whole state of a game of A3, without any turtle
+    head -> int, the cell of the head
+    body -> stored in deque[int], the cells of the body, tail first
+    monsters -> stored in list[int], the cell of every monster
+    foods -> stored in list, the cell of every food item or None once
+             eaten, food item i being numbered and worth i%5 + 1 segments
+    grid -> GridIndex of snake_grid.py, the body and food by cell
+    distance -> stored in list[int], the flow field: for every cell the
+                cost of the way from there to the head
+    clock -> the milliseconds played, advanced only by step()
+
+A cell is row * columns + column, the row counted from the bottom.
+Every position is an integer cell, so the same seed and the same keys
+always play the same game, and no float ever decides a contact.
+
+The game runs as four ticks, each returning the milliseconds until it
+runs again, or None once it stops:
+
+a. tick_count() -> the time shown in the status, every second
+b. tick_snake() -> the snake moves a cell, every 300ms, 500ms growing
+c. tick_monster() -> every monster moves a cell towards the head,
+   every 200ms to 400ms around the delay of the snake
+   The way is read from the flow field, searched once after every move
+   of the snake for all monsters: a breadth first search from the head,
+   where a body cell costs BODY_COST cells, so monsters go round the
+   body and the walls unless that is much longer. A monster with no body
+   between it and the head, in the rectangle they span, just steps
+   towards the head, which is a shortest way as well, and the search
+   only goes as far as the other monsters need, by settle().
+d. tick_food() -> some food items shift, every 5s to 10s
+
+step(dt) runs every tick due within dt milliseconds in time order, each
+at its own rate, so a game can be played headless as fast as Python
+goes. A front end may instead call the ticks from its own timers.
+What a tick changed is collected in changed, as "snake", "monsters",
+"food", "status" and "over", for the front end to draw.
+
+The arena and the numbers of monsters and food items can be chosen.
+For thousands of them SwarmEngine of snake_swarm.py keeps the monsters
+and the food in NumPy arrays and moves them all at once.
+
+Run this file directly for a benchmark of games per second. One core
+plays about 6,000 games a second with an idle snake, caught within 4s
+of game time, but only about 800 to 1,100 with greedy_bot, whose games
+last about 9s and move the monsters a hundred times or more. Both fall
+short of 10,000 games a second, the greedy games by ten times, as every
+move of a monster costs some microseconds of Python. Bots are best
+compared on fewer games, or on several processes at once.
+"""
+
+import random
+from collections import deque
+from functools import lru_cache
+from snake_grid import GridIndex
+
+TIMER_SNAKES = (300, 500)
+TIMER_COUNT = 1000
+TIMER_FOODS = (5000, 10000)
+TIMER_VIBRATION = 100
+
+# the arena of A3, 25x25 squares of 20 pixels
+COLUMNS = ROWS = 25
+MONSTERS = 4
+FOODS = 5
+SIZE = 5
+# food items are numbered 1 to 5 in turn, however many there are
+FOOD_NUMBERS = 5
+
+# how far from the head, in cells along each axis, things appear
+GAP_MONSTER = 4
+GAP_FOOD = 3
+SHIFT_FOOD = 2
+# food stays off the outer ring of cells
+MARGIN_FOOD = 1
+# tries of a food item to shift onto a free cell before it stays put
+SHIFT_ROUNDS = 4
+
+# how many free cells crossing a cell of the body is worth to a monster
+BODY_COST = 8
+
+KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_SPACE = \
+       "Up", "Down", "Left", "Right", "space"
+
+# directions in the order of the headings 0, 90, 180 and 270
+DIRECTIONS = (KEY_RIGHT, KEY_UP, KEY_LEFT, KEY_DOWN)
+DIRECTION_BY_KEY = {key: i for i, key in enumerate(DIRECTIONS)}
+
+@lru_cache(maxsize=None)
+def arena_tables(columns:int, rows:int) -> tuple:
+    """
+    Args:
+        columns (int): The squares from left to right.
+        rows (int): The squares from bottom to top.
+
+    Returns:
+        tuple: The column and the row of every cell, for every
+            direction the next cell of every cell, -1 at the border,
+            and the cells around every cell, computed only once per arena.
+    """
+
+    cells = range(columns * rows)
+    column = tuple(c % columns for c in cells)
+    row = tuple(c // columns for c in cells)
+    neighbour = (
+        tuple(c+1 if c % columns != columns-1 else -1 for c in cells),
+        tuple(c+columns if c // columns != rows-1 else -1 for c in cells),
+        tuple(c-1 if c % columns != 0 else -1 for c in cells),
+        tuple(c-columns if c // columns != 0 else -1 for c in cells))
+    around = tuple(tuple(n[c] for n in neighbour if n[c] >= 0) for c in cells)
+    return column, row, neighbour, around
+
+@lru_cache(maxsize=None)
+def spawn_area(columns:int, rows:int, gap:int, margin:int) -> tuple:
+    """
+    Args:
+        columns (int): The squares from left to right.
+        rows (int): The squares from bottom to top.
+        gap (int): The least distance from the head, in the middle of the
+            arena, along each axis, less in an arena too small for it.
+        margin (int): The rings of cells along the border left out.
+
+    Returns:
+        tuple: The columns and the rows a cell may be spawned in,
+            computed only once per arena.
+    """
+
+    head_column, head_row = columns//2, rows//2
+    # the gap shrinks to what the farthest corner inside the margin allows
+    gap = min(gap, max(head_column - margin, columns-1-margin - head_column),
+              max(head_row - margin, rows-1-margin - head_row))
+    return (tuple(c for c in range(margin, columns-margin)
+                  if abs(c - head_column) >= gap),
+            tuple(r for r in range(margin, rows-margin)
+                  if abs(r - head_row) >= gap))
+
+class SnakeEngine:
+    """
+    The rules and the state of A3, advanced by ticks.
+    """
+
+    def __init__(self, seed:int = None, columns:int = COLUMNS,
+                 rows:int = ROWS, monsters:int = MONSTERS,
+                 foods:int = FOODS):
+        """
+        Args:
+            seed (int, optional): The seed of the game. Defaults random.
+            columns (int, optional): The squares from left to right.
+            rows (int, optional): The squares from bottom to top.
+            monsters (int, optional): The number of monsters.
+            foods (int, optional): The number of food items.
+        """
+
+        if columns < 5 or rows < 5:
+            raise ValueError("The arena must be at least 5x5!")
+
+        self.rng = random.Random(seed)
+        # random() is several times faster than randint() and choice()
+        self.random = self.rng.random
+        self.columns = columns
+        self.rows = rows
+        self.column, self.row, self.neighbour, self.around = \
+            arena_tables(columns, rows)
+        self.grid = GridIndex(columns, rows)
+
+        self.head = rows//2 * columns + columns//2
+        self.body = deque()
+        self.size = SIZE
+        self.advances = 0
+        self.key = None
+        self.last_key = None
+        self.paused = False
+        self.blocked = False
+        self.contact = 0
+        self.timer = 0
+        self.over = None
+        self.snake_delay = TIMER_SNAKES[0]
+        # the flow field is searched when a monster first needs it
+        self.distance = None
+        self.buckets = None
+        self.level = 0
+
+        if foods > self.room(GAP_FOOD, MARGIN_FOOD):
+            raise ValueError("Too many food items for the arena!")
+        self.monsters = [self.spawn(GAP_MONSTER) for _ in range(monsters)]
+        self.foods = []
+        for index in range(foods):
+            cell = self.spawn(GAP_FOOD, MARGIN_FOOD)
+            while self.grid.food_at(cell) is not None:
+                cell = self.spawn(GAP_FOOD, MARGIN_FOOD)
+            self.grid.place_food(cell, index)
+            self.foods.append(cell)
+        self.food_left = foods
+
+        self.clock = 0
+        # the time every tick is due, all at once when the game starts
+        self.ticks = (self.tick_count, self.tick_snake, self.tick_monster,
+                      self.tick_food)
+        self.due = [0, 0, 0, 0]
+        self.changed = set()
+
+    def room(self, gap:int, margin:int = 0) -> int:
+        """
+        Args:
+            gap (int): The least distance from the head along each axis.
+            margin (int, optional): The rings of cells along the border
+                left out. Defaults none.
+
+        Returns:
+            int: The number of cells spawn() may choose from.
+        """
+
+        columns, rows = spawn_area(self.columns, self.rows, gap, margin)
+        return len(columns) * len(rows)
+
+    def spawn(self, gap:int, margin:int = 0) -> int:
+        """
+        Args:
+            gap (int): The least distance from the head along each axis,
+                less in an arena too small for it.
+            margin (int, optional): The rings of cells along the border
+                left out. Defaults none.
+
+        Returns:
+            int: A random cell at least gap away from the head.
+        """
+
+        columns, rows = spawn_area(self.columns, self.rows, gap, margin)
+        rand = self.random
+        return rows[int(rand() * len(rows))] * self.columns \
+            + columns[int(rand() * len(columns))]
+
+    def monster_cells(self) -> list[int]:
+        """
+        Returns:
+            list[int]: The cell of every monster.
+        """
+
+        return self.monsters
+
+    def food_cells(self) -> list:
+        """
+        Returns:
+            list: The cell of every food item, None once eaten.
+        """
+
+        return self.foods
+
+    def number(self, index:int) -> int:
+        """
+        Args:
+            index (int): The index of a food item.
+
+        Returns:
+            int: The number of the food item, the segments it is worth.
+        """
+
+        return index % FOOD_NUMBERS + 1
+
+    def eat(self, cell:int):
+        """
+        Args:
+            cell (int): The cell of the head.
+
+        Returns:
+            The index of the food item eaten on the cell, or None.
+        """
+
+        index = self.grid.take_food(cell)
+        if index is not None:
+            self.foods[index] = None
+        return index
+
+    def status(self) -> str:
+        """
+        Returns:
+            str: The status line of A3.
+        """
+
+        motion = "Paused" if self.paused else self.key
+        return f'Contact:{self.contact}   Time:{self.timer}   Motion:{motion}'
+
+    def press(self, key:str) -> None:
+        """
+        Args:
+            key (str): One of 'Up', 'Down', 'Left', 'Right' or 'space'.
+        """
+
+        if self.over:
+            return
+
+        if key == KEY_SPACE:
+            if self.key != KEY_SPACE:
+                self.last_key = self.key
+                self.key = key
+                self.paused = True
+            else:
+                self.key = self.last_key
+                self.paused = False
+        else:
+            self.key = key
+            self.paused = False
+        self.changed.add("status")
+
+    def tick_count(self):
+        """
+        Returns:
+            The milliseconds until the next tick, None once the game is over.
+        """
+
+        if self.over:
+            return None
+        self.timer += 1
+        self.changed.add("status")
+        return TIMER_COUNT
+
+    def tick_snake(self):
+        """
+        Moves the head a cell in the direction of the key. The cell it
+        leaves becomes the front of the body, and the tail leaves its
+        cell unless the snake is still growing.
+
+        Returns:
+            The milliseconds until the next tick, None once the game is over.
+        """
+
+        if self.over:
+            return None
+        if self.paused or self.key is None:
+            return self.snake_delay
+
+        old = self.head
+        new = self.neighbour[DIRECTION_BY_KEY[self.key]][old]
+        self.blocked = new < 0
+        if self.blocked:
+            return self.snake_delay
+        self.head = new
+
+        # consume food if needed
+        index = self.eat(new)
+        if index is not None:
+            self.food_left -= 1
+            self.size += self.number(index)
+            self.changed.add("food")
+
+        # shifting or extending the tail
+        grid, body = self.grid, self.body
+        if len(body) >= self.size:
+            grid.remove_body(body.popleft())
+            self.snake_delay = TIMER_SNAKES[0]
+        else:
+            self.snake_delay = TIMER_SNAKES[1]
+        body.append(old)
+        grid.add_body(old)
+        self.advances += 1
+        self.distance = None
+        self.changed.add("snake")
+
+        if len(body) == self.size and not self.food_left:
+            self.over = "winner"
+            self.changed.add("over")
+            return None
+        return self.snake_delay
+
+    def start_field(self) -> None:
+        """
+        Starts the search of the flow field from the head, without
+        settling any cell yet. Entering a cell costs 1, or BODY_COST on
+        the body, and the cells are taken in the order of their cost. As
+        a cost grows by BODY_COST at most, BODY_COST+1 buckets of cells,
+        used in turn, are enough.
+
+        The search goes on only as far as settle() is asked: the cells on
+        the way of a monster are all cheaper than the monster, and the
+        monsters only move to cheaper cells until the snake moves again.
+        """
+
+        cells = len(self.around)
+        self.distance = [cells * BODY_COST] * cells
+        self.distance[self.head] = 0
+        self.buckets = [[] for _ in range(BODY_COST + 1)]
+        self.buckets[0].append(self.head)
+        self.level = 0
+
+    def settle(self, cell:int) -> int:
+        """
+        Goes on with the search until the cost of the cell is known,
+        and so the cost of every cheaper cell, and no further.
+
+        Args:
+            cell (int): A cell of the arena.
+
+        Returns:
+            int: The cost of the way from the cell to the head.
+        """
+
+        around, body = self.around, self.grid.body
+        distance, buckets = self.distance, self.buckets
+        turns = BODY_COST + 1
+        # a cost is known once every cheaper cost has been searched
+        while self.level < distance[cell]:
+            cost = self.level
+            bucket = buckets[cost % turns]
+            for other in bucket:
+                if distance[other] != cost:
+                    continue
+                # the way from a cell around enters this cell
+                further = cost + (BODY_COST if body[other] else 1)
+                later = buckets[further % turns]
+                for near in around[other]:
+                    if further < distance[near]:
+                        distance[near] = further
+                        later.append(near)
+            bucket.clear()
+            self.level += 1
+        return distance[cell]
+
+    def tick_monster(self):
+        """
+        Moves every monster a cell along the flow field towards the head,
+        at random between cells that are equally short a way.
+
+        Returns:
+            The milliseconds until the next tick, None once the game is over.
+        """
+
+        if self.over:
+            return None
+
+        head, around, monsters = self.head, self.around, self.monsters
+        column, row, neighbour = self.column, self.row, self.neighbour
+        body, rand = self.grid.body, self.random
+        head_column, head_row = column[head], row[head]
+        # the rectangle around the body, a monster sharing none of it
+        # with the head steps straight towards it
+        if self.body:
+            columns = list(map(column.__getitem__, self.body))
+            rows = list(map(row.__getitem__, self.body))
+            left, right = min(columns), max(columns)
+            bottom, top = min(rows), max(rows)
+        else:
+            left = bottom = len(around)
+            right = top = -1
+        # the sides of the rectangle the head is beyond
+        head_left, head_right = head_column < left, head_column > right
+        head_below, head_above = head_row < bottom, head_row > top
+        # a pass over the body per monster is dearer than the whole
+        # flow field once there are many of both
+        look = len(self.body) * len(monsters) <= len(around)
+        for i, monster in enumerate(monsters):
+
+            # judge the condition
+            if monster == head:
+                self.over = "loser"
+                self.changed.update(("monsters", "over"))
+                return None
+
+            # increase contact if needed
+            if body[monster]:
+                self.contact += 1
+                self.changed.add("status")
+
+            # a straight way is shortest, the flow field is only
+            # searched for the monsters the body stands in the way of
+            monster_column, monster_row = column[monster], row[monster]
+            if (head_left and monster_column < left) \
+                    or (head_right and monster_column > right) \
+                    or (head_below and monster_row < bottom) \
+                    or (head_above and monster_row > top):
+                dx = head_column - monster_column
+                if dx and (monster_row == head_row or rand() < 0.5):
+                    monsters[i] = neighbour[0 if dx > 0 else 2][monster]
+                else:
+                    monsters[i] = neighbour[1 if head_row > monster_row
+                                            else 3][monster]
+                continue
+            ways = self.straight_ways(monster) if look else None
+            if ways:
+                monsters[i] = ways[0] if len(ways) == 1 or rand() < 0.5 \
+                    else ways[1]
+                continue
+
+            # the cells around on a shortest way to the head
+            if self.distance is None:
+                self.start_field()
+            cost = self.settle(monster)
+            distance = self.distance
+            best = None
+            count = 0
+            for cell in around[monster]:
+                if distance[cell] + (BODY_COST if body[cell] else 1) == cost:
+                    count += 1
+                    if best is None or rand() * count < 1:
+                        best = cell
+            monsters[i] = best
+
+        self.changed.add("monsters")
+        return self.snake_delay - TIMER_VIBRATION \
+            + int(rand() * (2*TIMER_VIBRATION + 1))
+
+    def straight_ways(self, monster:int) -> list[int]:
+        """
+        Finds the cells around the monster, nearer to the head, from which
+        a way to the head goes straight, only nearer at every step, and
+        never over the body. Such a way costs a cell per step, so it is
+        a shortest way, whatever the rest of the arena is like.
+
+        Args:
+            monster (int): The cell of a monster, not the head.
+
+        Returns:
+            list[int]: These cells, none if the body is in the way.
+        """
+
+        column, row, neighbour = self.column, self.row, self.neighbour
+        head = self.head
+        head_column, head_row = column[head], row[head]
+        dx = head_column - column[monster]
+        dy = head_row - row[monster]
+
+        # the rectangle as bits, a row of it per int, the bit c of row r
+        # the cell c columns and r rows off the head towards the monster
+        width, height = abs(dx) + 1, abs(dy) + 1
+        sign_x = -1 if dx > 0 else 1
+        sign_y = -1 if dy > 0 else 1
+        blocked = [0] * height
+        for cell in self.body:
+            c = (column[cell] - head_column) * sign_x
+            r = (row[cell] - head_row) * sign_y
+            if 0 <= c < width and 0 <= r < height:
+                blocked[r] |= 1 << c
+
+        # a row is reached above a cell reached in the row before, and
+        # along the run of free cells from there, which the carry of an
+        # addition runs through in one go
+        full = (1 << width) - 1
+        reached = 1
+        rows = []
+        for r in range(height):
+            free = full & ~blocked[r]
+            seeds = reached & free
+            reached = (((free + seeds) ^ free) & free) | seeds
+            rows.append(reached)
+
+        ways = []
+        if dx and rows[-1] >> (width - 2) & 1:
+            ways.append(neighbour[0 if dx > 0 else 2][monster])
+        if dy and rows[-2] >> (width - 1) & 1:
+            ways.append(neighbour[1 if dy > 0 else 3][monster])
+        return ways
+
+    def tick_food(self):
+        """
+        Shifts a random number of the food items left, each up to two
+        cells along each axis, never off the margin or onto another item.
+        An item that finds no free cell in SHIFT_ROUNDS tries stays put.
+
+        Returns:
+            The milliseconds until the next tick, None once all is eaten.
+        """
+
+        left = [i for i, cell in enumerate(self.foods) if cell is not None]
+        if self.over or not left:
+            return None
+
+        rng, grid = self.rng, self.grid
+        columns, rows = self.columns, self.rows
+        low, high_column, high_row = \
+            MARGIN_FOOD, columns-1-MARGIN_FOOD, rows-1-MARGIN_FOOD
+        for index in rng.sample(left, rng.randint(1, len(left))):
+            old = self.foods[index]
+            column, row = self.column[old], self.row[old]
+            for _ in range(SHIFT_ROUNDS):
+                new_column = column + rng.randint(-SHIFT_FOOD, SHIFT_FOOD)
+                new_row = row + rng.randint(-SHIFT_FOOD, SHIFT_FOOD)
+                new = new_row * columns + new_column
+                if low <= new_column <= high_column \
+                        and low <= new_row <= high_row \
+                        and (new == old or grid.food_at(new) is None):
+                    grid.move_food(old, new)
+                    self.foods[index] = new
+                    break
+
+        self.changed.add("food")
+        return rng.randint(*TIMER_FOODS)
+
+    def take_changes(self) -> set:
+        """
+        Returns:
+            set: What changed since the last call, for the front end.
+        """
+
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def step(self, dt:float) -> set:
+        """
+        Args:
+            dt (float): The milliseconds to play.
+
+        Returns:
+            set: What changed since the last call, for the front end.
+        """
+
+        self.clock += dt
+        due, ticks = self.due, self.ticks
+        while self.over is None:
+            # the earliest tick first, in the order of ticks on a tie
+            time = min(due)
+            if time > self.clock:
+                break
+            i = due.index(time)
+            delay = ticks[i]()
+            due[i] = time + delay if delay is not None else float("inf")
+        return self.take_changes()
+
+def greedy_bot(engine:SnakeEngine) -> str:
+    """
+    Args:
+        engine (SnakeEngine): A game in play.
+
+    Returns:
+        str: The key towards the first food item left, or None.
+    """
+
+    for cell in engine.food_cells():
+        if cell is not None:
+            dx = engine.column[cell] - engine.column[engine.head]
+            dy = engine.row[cell] - engine.row[engine.head]
+            if dx:
+                return KEY_RIGHT if dx > 0 else KEY_LEFT
+            return KEY_UP if dy > 0 else KEY_DOWN
+    return None
+
+def simulate(seed:int, bot = greedy_bot, limit:int = 120_000,
+             **arena) -> SnakeEngine:
+    """
+    Args:
+        seed (int): The seed of the game.
+        bot (optional): Called before every move of the snake with the
+            engine, returns the key to press or None.
+        limit (int, optional): The milliseconds after which it stops.
+        **arena: columns, rows, monsters and foods of SnakeEngine.
+
+    Returns:
+        SnakeEngine: The game once it is over or out of time.
+    """
+
+    engine = SnakeEngine(seed, **arena)
+    while engine.over is None and engine.clock < limit:
+        key = bot(engine)
+        if key is not None and key != engine.key:
+            engine.press(key)
+        # play until the snake has moved
+        engine.step(max(engine.due[1] - engine.clock, 0))
+        engine.changed.clear()
+    return engine
+
+def benchmark(games:int = 10_000, seed:int = 0) -> None:
+    """
+    Args:
+        games (int, optional): The number of games to simulate.
+        seed (int, optional): The seed of the first game.
+    """
+
+    from time import perf_counter
+
+    for name, bot in (("idle", lambda engine: None),
+                      ("greedy", greedy_bot)):
+        start = perf_counter()
+        results = {"winner": 0, "loser": 0, None: 0}
+        for i in range(games):
+            results[simulate(seed + i, bot).over] += 1
+        spent = perf_counter() - start
+        print(f"{name}: {games / spent:,.0f} games/s, "
+              f"{results['winner']} won, {results['loser']} lost, "
+              f"{results[None]} out of time")
+
+if __name__ == "__main__":
+    benchmark()
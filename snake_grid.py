@@ -0,0 +1,97 @@
+"""
+Here is the data model:
+
+GridIndex -> the play area of A3 cut into squares, each an integer cell
+    cell = row * columns + column, row counted from the bottom
+    body -> stored in bytearray, the number of snake segments per cell
+    food -> stored in dict, from cell to the index of the food item in
+            SnakeEngine.foods
+
+Everything in A3 moves by whole cells, the snake, the monsters and the
+food, so the checks are single lookups instead of scans:
+
+a. head vs food -> take_food(cell)
+b. head vs body and monster vs body -> body[cell]
+c. food vs food when an item shifts -> food_at(cell)
+
+The index is updated incrementally: a segment is added where the head
+leaves and removed where the tail leaves, and a food item is moved from
+cell to cell when it shifts.
+"""
+
+class GridIndex:
+    """
+    An occupancy index of the snake body and the food over the play area.
+    """
+
+    def __init__(self, columns:int, rows:int):
+        """
+        Args:
+            columns (int): The number of squares from left to right.
+            rows (int): The number of squares from bottom to top.
+        """
+
+        self.columns = columns
+        self.rows = rows
+        self.body = bytearray(columns * rows)
+        self.food = {}
+
+    def add_body(self, cell:int) -> None:
+        """
+        Args:
+            cell (int): The cell a segment of the snake now covers.
+        """
+
+        if cell >= 0:
+            self.body[cell] += 1
+
+    def remove_body(self, cell:int) -> None:
+        """
+        Args:
+            cell (int): The cell a segment of the snake has left.
+        """
+
+        if cell >= 0 and self.body[cell]:
+            self.body[cell] -= 1
+
+    def place_food(self, cell:int, index:int) -> None:
+        """
+        Args:
+            cell (int): The cell of the food item.
+            index (int): The index of the food item in SnakeEngine.foods.
+        """
+
+        self.food[cell] = index
+
+    def move_food(self, old:int, new:int) -> None:
+        """
+        Args:
+            old (int): The cell the food item leaves.
+            new (int): The cell the food item shifts to.
+        """
+
+        index = self.food.pop(old, None)
+        if index is not None:
+            self.food[new] = index
+
+    def food_at(self, cell:int):
+        """
+        Args:
+            cell (int): A cell of the play area.
+
+        Returns:
+            The index of the food item on the cell, or None.
+        """
+
+        return self.food.get(cell)
+
+    def take_food(self, cell:int):
+        """
+        Args:
+            cell (int): The cell of the head of the snake.
+
+        Returns:
+            The index of the food item eaten on the cell, or None.
+        """
+
+        return self.food.pop(cell, None)
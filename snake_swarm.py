@@ -0,0 +1,338 @@
+"""
+Here is the data model:
+
+SwarmEngine -> a SnakeEngine of snake_engine.py for crowded arenas
+    monsters -> stored in numpy.ndarray, the cell of every monster
+    foods -> stored in numpy.ndarray, the cell of every food item,
+             -1 once eaten
+    food_owner -> stored in numpy.ndarray, for every cell the index of
+                  the food item on it, -1 for none, in place of the food
+                  of the GridIndex, which is dropped so it is never stale
+    body -> the body counts of the GridIndex, seen as an array without
+            a copy, so it is always up to date
+
+The rules are those of SnakeEngine, but every tick works on the arrays
+at once, so thousands of monsters and food items cost a few NumPy
+operations instead of a Python loop each:
+
+a. tick_monster() -> the monsters with no body between them and the
+   head step straight towards it, and the others read the flow field
+   around them, all in one (4, k) lookup, and move to a cell on a
+   shortest way, chosen at random between equal ways
+b. tick_food() -> the shifted items are drawn, moved, kept inside the
+   margin and off other items, all at once, a few times over for those
+   that could not move
+c. eat() -> one lookup in food_owner
+
+new_engine() -> a SwarmEngine, or a SnakeEngine where NumPy is missing
+
+Run this file directly for a benchmark of a crowded arena.
+"""
+
+from functools import lru_cache
+from snake_engine import (BODY_COST, MARGIN_FOOD, SHIFT_FOOD, SHIFT_ROUNDS,
+                          TIMER_FOODS, TIMER_VIBRATION, SnakeEngine,
+                          arena_tables)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("snake_swarm requires numpy")
+
+@lru_cache(maxsize=None)
+def _array_tables(columns:int, rows:int) -> tuple:
+    # arena_tables() as arrays, the border being one more cell, out of
+    # the arena, so that a lookup never needs a check
+    column, row, neighbour, _ = arena_tables(columns, rows)
+    cells = columns * rows
+    around = np.array(neighbour, dtype=np.int64)
+    around[around < 0] = cells
+    return np.array(column), np.array(row), around
+
+def new_engine(seed:int = None, **arena) -> SnakeEngine:
+    """
+    Args:
+        seed (int, optional): The seed of the game. Defaults random.
+        **arena: columns, rows, monsters and foods of SnakeEngine.
+
+    Returns:
+        SnakeEngine: A SwarmEngine if NumPy is installed, else a SnakeEngine.
+    """
+
+    if np is None:
+        return SnakeEngine(seed, **arena)
+    return SwarmEngine(seed, **arena)
+
+class SwarmEngine(SnakeEngine):
+    """
+    The rules and the state of A3, with monsters and food in arrays.
+    """
+
+    def __init__(self, seed:int = None, **arena):
+        """
+        Args:
+            seed (int, optional): The seed of the game. Defaults random.
+            **arena: columns, rows, monsters and foods of SnakeEngine.
+        """
+
+        _require_numpy()
+        super().__init__(seed, **arena)
+        self.generator = np.random.default_rng(seed)
+        self.column_of, self.row_of, self.around_of = \
+            _array_tables(self.columns, self.rows)
+
+        cells = self.columns * self.rows
+        self.monsters = np.array(self.monsters, dtype=np.int64)
+        self.foods = np.array(self.foods, dtype=np.int64)
+        self.food_owner = np.full(cells, -1, dtype=np.int64)
+        self.food_owner[self.foods] = np.arange(len(self.foods))
+        self.grid.food = None
+        self.body_counts = np.frombuffer(self.grid.body, dtype=np.uint8)
+        # the cost of the way through every cell, one more for the border
+        self.through = None
+
+    def monster_cells(self) -> list[int]:
+        """
+        Returns:
+            list[int]: The cell of every monster.
+        """
+
+        return self.monsters.tolist()
+
+    def food_cells(self) -> list:
+        """
+        Returns:
+            list: The cell of every food item, None once eaten.
+        """
+
+        return [cell if cell >= 0 else None for cell in self.foods.tolist()]
+
+    def eat(self, cell:int):
+        """
+        Args:
+            cell (int): The cell of the head.
+
+        Returns:
+            The index of the food item eaten on the cell, or None.
+        """
+
+        index = int(self.food_owner[cell])
+        if index < 0:
+            return None
+        self.food_owner[cell] = -1
+        self.foods[index] = -1
+        return index
+
+    def flow_field(self, targets=None):
+        """
+        Searches from the head as SnakeEngine.settle(), but a whole
+        cost at once: the cells reached at that cost give their cost
+        plus their own entering cost to all the cells around them.
+
+        Args:
+            targets (numpy.ndarray, optional): The cells the search must
+                reach. Defaults every monster.
+
+        Returns:
+            numpy.ndarray: For every cell the cost of the way to the head,
+                too high where the search has not got to.
+        """
+
+        cells = self.columns * self.rows
+        far = cells * BODY_COST
+        # entering a cell costs 1, or BODY_COST on the body, and the
+        # border can never be entered
+        cost = np.ones(cells + 1, dtype=np.int64)
+        cost[:cells] += (BODY_COST - 1) * (self.body_counts > 0)
+        cost[cells] = far
+        distance = np.full(cells + 1, far, dtype=np.int64)
+        # the border is never reached, and counts as far in through
+        distance[cells] = 0
+        distance[self.head] = 0
+
+        around = self.around_of
+        monsters = self.monsters if targets is None else targets
+        # the last place of every cell in an array, which keeps one copy
+        # of each cell without sorting
+        place = np.zeros(cells + 1, dtype=np.int64)
+        buckets = {0: [np.array([self.head])]}
+        level = 0
+        while buckets:
+            reached = buckets.pop(level, None)
+            if reached is not None:
+                reached = np.concatenate(reached)
+                reached = reached[distance[reached] == level]
+                order = np.arange(len(reached))
+                place[reached] = order
+                reached = reached[place[reached] == order]
+                for step in (1, BODY_COST):
+                    # the way from the cells around enters these cells
+                    near = around[:, reached[cost[reached] == step]]
+                    near = near[distance[near] > level + step]
+                    if len(near):
+                        distance[near] = level + step
+                        buckets.setdefault(level + step, []).append(near)
+            # the monsters only need cheaper cells than their own
+            if distance[monsters].max(initial=0) <= level:
+                break
+            level += 1
+
+        # the costs up to level are known
+        self.level = level
+        self.distance_of = distance[:cells]
+        self.through = distance + cost
+        self.distance = self.distance_of
+        return self.distance_of
+
+    def tick_monster(self):
+        """
+        Moves every monster a cell along the flow field towards the head,
+        at random between cells that are equally short a way.
+
+        Returns:
+            The milliseconds until the next tick, None once the game is over.
+        """
+
+        if self.over:
+            return None
+
+        monsters, head = self.monsters, self.head
+
+        # judge the condition
+        if (monsters == head).any():
+            self.over = "loser"
+            self.changed.add("over")
+            return None
+
+        # increase contact if needed
+        touching = int(np.count_nonzero(self.body_counts[monsters]))
+        if touching:
+            self.contact += touching
+            self.changed.add("status")
+
+        # a straight way is shortest where the rectangle spanned by the
+        # monster and the head shares nothing with the one around the body
+        column, row = self.column_of[monsters], self.row_of[monsters]
+        head_column, head_row = self.column_of[head], self.row_of[head]
+        if self.body:
+            body = np.fromiter(self.body, dtype=np.int64, count=len(self.body))
+            body_column, body_row = self.column_of[body], self.row_of[body]
+            straight = (np.maximum(column, head_column) < body_column.min()) \
+                | (np.minimum(column, head_column) > body_column.max()) \
+                | (np.maximum(row, head_row) < body_row.min()) \
+                | (np.minimum(row, head_row) > body_row.max())
+        else:
+            straight = np.ones(len(monsters), dtype=bool)
+
+        dx = np.sign(head_column - column[straight])
+        dy = np.sign(head_row - row[straight])
+        along_x = (dx != 0) & ((dy == 0)
+                               | (self.generator.random(len(dx)) < 0.5))
+        monsters[straight] += np.where(along_x, dx, dy * self.columns)
+
+        # the cells around on a shortest way to the head, one at random
+        blocked = np.flatnonzero(~straight)
+        if len(blocked):
+            cells = monsters[blocked]
+            if self.distance is None \
+                    or self.distance_of[cells].max() > self.level:
+                self.flow_field(cells)
+            around = self.around_of[:, cells]
+            ways = self.through[around] == self.distance_of[cells]
+            chosen = np.argmax(ways * self.generator.random(ways.shape),
+                               axis=0)
+            moving = ways.any(axis=0)
+            monsters[blocked[moving]] = \
+                around[chosen, np.arange(len(cells))][moving]
+
+        self.changed.add("monsters")
+        return self.snake_delay - TIMER_VIBRATION \
+            + int(self.random() * (2*TIMER_VIBRATION + 1))
+
+    def tick_food(self):
+        """
+        Shifts a random number of the food items left, each up to two
+        cells along each axis, never off the margin or onto another item.
+
+        Returns:
+            The milliseconds until the next tick, None once all is eaten.
+        """
+
+        left = np.flatnonzero(self.foods >= 0)
+        if self.over or len(left) == 0:
+            return None
+
+        generator, owner, foods = self.generator, self.food_owner, self.foods
+        columns, rows = self.columns, self.rows
+        movers = generator.choice(left, generator.integers(1, len(left) + 1),
+                                  replace=False)
+        for _ in range(SHIFT_ROUNDS):
+            old = foods[movers]
+            column = self.column_of[old] + generator.integers(
+                -SHIFT_FOOD, SHIFT_FOOD + 1, len(movers))
+            row = self.row_of[old] + generator.integers(
+                -SHIFT_FOOD, SHIFT_FOOD + 1, len(movers))
+            inside = (column >= MARGIN_FOOD) \
+                & (column <= columns-1-MARGIN_FOOD) \
+                & (row >= MARGIN_FOOD) & (row <= rows-1-MARGIN_FOOD)
+            new = np.where(inside, row * columns + column, old)
+            free = inside & ((owner[new] < 0) | (new == old))
+            # of the items shifting onto one cell only the first may
+            _, first = np.unique(new, return_index=True)
+            alone = np.zeros(len(movers), dtype=bool)
+            alone[first] = True
+            shifted = free & alone
+
+            owner[old[shifted]] = -1
+            owner[new[shifted]] = movers[shifted]
+            foods[movers[shifted]] = new[shifted]
+            movers = movers[~shifted]
+            if len(movers) == 0:
+                break
+
+        self.changed.add("food")
+        return self.rng.randint(*TIMER_FOODS)
+
+def benchmark(ticks:int = 1000, size:int = 100, monsters:int = 2000,
+              foods:int = 1000, seed:int = 0) -> None:
+    """
+    Args:
+        ticks (int, optional): The number of monster and food ticks.
+        size (int, optional): The squares along each side of the arena.
+        monsters (int, optional): The number of monsters.
+        foods (int, optional): The number of food items.
+        seed (int, optional): The seed of the game.
+    """
+
+    from time import perf_counter
+
+    arena = dict(columns=size, rows=size, monsters=monsters, foods=foods)
+    for name, engine in (("python", SnakeEngine(seed, **arena)),
+                         ("numpy", SwarmEngine(seed, **arena))):
+        # a long snake across the middle of the arena
+        for r in range(size//4, size - size//4):
+            engine.body.append(r * size + size//2)
+            engine.grid.add_body(r * size + size//2)
+        heads = engine.rng.choices(range(size*size), k=ticks)
+        start = perf_counter()
+        for head in heads:
+            # the head jumps, so the flow field is searched every tick for
+            # the monsters behind the snake, and the game goes on even if
+            # a monster catches it
+            engine.head, engine.distance, engine.over = head, None, None
+            engine.tick_monster()
+        monster_spent = perf_counter() - start
+        start = perf_counter()
+        for _ in range(ticks):
+            engine.tick_food()
+        food_spent = perf_counter() - start
+        print(f"{name} {size}x{size}, {monsters} monsters, {foods} food: "
+              f"{ticks / monster_spent:,.0f} monster ticks/s, "
+              f"{ticks / food_spent:,.0f} food ticks/s")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,33 @@
+import pytest
+import pattern_database
+
+GROUP = (1, 2, 3, 4)
+
+def _quiet(message:str) -> None:
+    pass
+
+@pytest.mark.parametrize("depth", [0, 5, 12])
+def test_resumed_build_matches_clean_build(tmp_path, monkeypatch, depth):
+    clean = pattern_database.build(3, GROUP, str(tmp_path / "clean"),
+                                   report=_quiet)
+
+    search_layer = pattern_database._search_layer
+
+    def interrupted(work, layer, *args):
+        # stop right after a layer is searched, before the next is noted
+        search_layer(work, layer, *args)
+        if layer == depth:
+            raise KeyboardInterrupt
+
+    directory = str(tmp_path / "resumed")
+    monkeypatch.setattr(pattern_database, "_search_layer", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        pattern_database.build(3, GROUP, directory, report=_quiet)
+    monkeypatch.setattr(pattern_database, "_search_layer", search_layer)
+    resumed = pattern_database.build(3, GROUP, directory, report=_quiet)
+
+    with open(clean, "rb") as f:
+        expected = f.read()
+    with open(resumed, "rb") as f:
+        assert f.read() == expected
+    assert max(expected) < pattern_database.UNREACHED
@@ -0,0 +1,13 @@
+from puzzle_batch import solve_stream
+
+def test_bad_line_in_the_middle_of_a_batch():
+    lines = ["1 2 3 4 5 6 7 0 8",
+             "1 2 3 4 5 6 7 8",
+             "1 2 x 4 5 6 7 0 8",
+             "1 2 2 4 5 6 7 0 8",
+             '[1, 2, 3, 4, 5, 6, " ", 7, 8]']
+    results = list(solve_stream(lines, workers=2, chunk=2))
+    assert len(results) == 5
+    assert results[0]["length"] == 1
+    assert [set(result) for result in results[1:4]] == [{"error"}] * 3
+    assert results[4]["length"] == 2
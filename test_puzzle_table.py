@@ -0,0 +1,50 @@
+from collections import deque
+import pytest
+import puzzle_table
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+
+def _slide(board:tuple, blank:int, cell:int) -> tuple:
+    tiles = list(board)
+    tiles[blank], tiles[cell] = tiles[cell], 0
+    return tuple(tiles)
+
+def _around(blank:int) -> list:
+    row, col = divmod(blank, 3)
+    return [blank + d for d, ok in ((1, col != 2), (-1, col != 0),
+                                    (3, row != 2), (-3, row != 0)) if ok]
+
+@pytest.fixture(scope="module")
+def depths():
+    # every solvable board by its number of moves from the goal
+    found = {GOAL: 0}
+    queue = deque([GOAL])
+    while queue:
+        board = queue.popleft()
+        blank = board.index(0)
+        for cell in _around(blank):
+            following = _slide(board, blank, cell)
+            if following not in found:
+                found[following] = found[board] + 1
+                queue.append(following)
+    return found
+
+@pytest.fixture(autouse=True)
+def table(tmp_path, monkeypatch):
+    monkeypatch.setattr(puzzle_table, "_table", None)
+    return puzzle_table.load(str(tmp_path / "distance_3x3.bin"))
+
+def test_distance_matches_breadth_first_search(depths):
+    assert len(depths) == puzzle_table.STATES
+    for board, depth in depths.items():
+        assert puzzle_table.distance(list(board)) == depth
+
+def test_best_move_is_one_move_nearer(depths):
+    # a cell slides into the blank, as the moves of play_the_puzzle()
+    slides = {"left": 1, "right": -1, "up": 3, "down": -3}
+    assert puzzle_table.best_move(list(GOAL)) is None
+    for board, depth in list(depths.items())[1::97]:
+        blank = board.index(0)
+        cell = blank + slides[puzzle_table.best_move(list(board))]
+        assert cell in _around(blank)
+        assert depths[_slide(board, blank, cell)] == depth - 1
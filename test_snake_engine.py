@@ -0,0 +1,24 @@
+import pytest
+from snake_engine import SnakeEngine, greedy_bot, simulate
+
+def _state(engine:SnakeEngine) -> tuple:
+    return (engine.over, engine.head, list(engine.body), engine.contact,
+            engine.advances, list(engine.monsters), list(engine.foods))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_same_seed_plays_the_same_game(seed):
+    first = simulate(seed, greedy_bot)
+    second = simulate(seed, greedy_bot)
+    assert first.over is not None
+    assert _state(first) == _state(second)
+    assert first.clock == second.clock
+
+@pytest.mark.parametrize("seed", range(5))
+def test_same_game_whatever_the_frame_length(seed):
+    games = []
+    for dt in (1, 17, 1000):
+        engine = SnakeEngine(seed)
+        while engine.over is None:
+            engine.step(dt)
+        games.append(_state(engine))
+    assert games[0] == games[1] == games[2]